@@ -1,8 +1,56 @@
+import asyncio
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import httpx
+import numpy as np
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 OLLAMA_URL = "http://localhost:11434/api/generate"
 
-PROMPT = """
+# (connect, read) - the read side has to cover a full LLM generation
+OLLAMA_TIMEOUT = (3, 30)
+
+SESSION = requests.Session()
+SESSION.mount(
+    "http://",
+    HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.2)
+    )
+)
+
+# concurrent generations for batch extraction; keep in line with the
+# OLLAMA_NUM_PARALLEL the Ollama server was started with
+OLLAMA_NUM_PARALLEL = int(os.environ.get("OLLAMA_NUM_PARALLEL", 4))
+
+# exact-match tier: sha256(complaint) -> intent
+CACHE_SIZE = 4096
+_exact_cache = OrderedDict()
+
+# semantic tier: L2-normalised title+description embeddings -> intent,
+# kept in a preallocated ring buffer. Only near-identical complaints count
+# as a hit, and INVALID is never stored: a junk complaint must not mark
+# later ones with the same wording as invalid.
+SEMANTIC_THRESHOLD = 0.97
+EMBED_DIM = 384
+_semantic_embeds = np.zeros((CACHE_SIZE, EMBED_DIM), dtype=np.float32)
+_semantic_intents = [None] * CACHE_SIZE
+_semantic_count = 0
+_semantic_next = 0
+
+# both tiers are shared by request threads
+_cache_lock = threading.Lock()
+
+# Sent as the generate "system" field: the text is identical on every call,
+# so Ollama reuses its prefilled KV cache and only the complaint is new work
+SYSTEM_PROMPT = """
 You are given a civic complaint.
 
 If the text is meaningless, gibberish, unrelated to civic issues,
@@ -21,25 +69,126 @@ Ignore:
 
 Do NOT mention departments.
 Do NOT add new information.
-
-Complaint:
-{complaint}
 """
 
-def extract_intent_or_invalid(title: str, description: str) -> str:
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _build_payload(complaint: str) -> bytes:
+    # encoded once with orjson and sent as raw bytes, instead of letting
+    # requests/httpx run the stdlib encoder on every call
+    return orjson.dumps({
+        "model": "qwen2.5:1.5b-instruct",
+        "system": SYSTEM_PROMPT,
+        "prompt": f"Complaint:\n{complaint}",
+        "stream": False,
+        "options": {
+            "temperature": 0
+        }
+    })
+
+
+def _cache_get(key):
+    with _cache_lock:
+        intent = _exact_cache.get(key)
+        if intent is not None:
+            _exact_cache.move_to_end(key)
+        return intent
+
+
+def _semantic_get(complaint_embed):
+    with _cache_lock:
+        if not _semantic_count:
+            return None
+
+        sims = _semantic_embeds[:_semantic_count] @ complaint_embed
+        best = int(np.argmax(sims))
+        if sims[best] >= SEMANTIC_THRESHOLD:
+            return _semantic_intents[best]
+        return None
+
+
+def _cache_put(key, complaint_embed, intent):
+    global _semantic_count, _semantic_next
+
+    with _cache_lock:
+        _exact_cache[key] = intent
+        if len(_exact_cache) > CACHE_SIZE:
+            _exact_cache.popitem(last=False)
+
+        if complaint_embed is not None and intent.upper() != "INVALID":
+            # overwrite the oldest slot once the buffer is full
+            _semantic_embeds[_semantic_next] = complaint_embed
+            _semantic_intents[_semantic_next] = intent
+            _semantic_next = (_semantic_next + 1) % CACHE_SIZE
+            _semantic_count = min(_semantic_count + 1, CACHE_SIZE)
+
+
+def extract_intent_or_invalid(title: str, description: str, embedder=None) -> str:
     complaint = f"{title}\n{description}".strip()
 
-    r = requests.post(
+    key = hashlib.sha256(complaint.encode()).hexdigest()
+    intent = _cache_get(key)
+    if intent is not None:
+        return intent
+
+    # near-duplicate lookup needs the router's embedder
+    complaint_embed = None
+    if embedder is not None:
+        complaint_embed = embedder.encode(
+            complaint,
+            normalize_embeddings=True
+        ).astype(np.float32)
+
+        intent = _semantic_get(complaint_embed)
+        if intent is not None:
+            _cache_put(key, None, intent)
+            return intent
+
+    r = SESSION.post(
         OLLAMA_URL,
-        json={
-            "model": "qwen2.5:1.5b-instruct",
-            "prompt": PROMPT.format(complaint=complaint),
-            "stream": False,
-            "options": {
-                "temperature": 0
-            }
-        },
-        timeout=5
+        data=_build_payload(complaint),
+        headers=JSON_HEADERS,
+        timeout=OLLAMA_TIMEOUT
     )
     r.raise_for_status()
-    return r.json()["response"].strip()
+    intent = r.json()["response"].strip()
+
+    _cache_put(key, complaint_embed, intent)
+    return intent
+
+
+async def extract_intents_batch(pairs: list[tuple[str, str]]) -> list[str]:
+    complaints = [f"{title}\n{description}".strip() for title, description in pairs]
+    keys = [hashlib.sha256(c.encode()).hexdigest() for c in complaints]
+
+    semaphore = asyncio.Semaphore(OLLAMA_NUM_PARALLEL)
+    timeout = httpx.Timeout(OLLAMA_TIMEOUT[1], connect=OLLAMA_TIMEOUT[0])
+
+    async with httpx.AsyncClient(timeout=timeout) as client:
+
+        async def extract(complaint, key):
+            intent = _cache_get(key)
+            if intent is not None:
+                return intent
+
+            async with semaphore:
+                r = await client.post(
+                    OLLAMA_URL,
+                    content=_build_payload(complaint),
+                    headers=JSON_HEADERS
+                )
+            r.raise_for_status()
+            intent = r.json()["response"].strip()
+
+            _cache_put(key, None, intent)
+            return intent
+
+        return await asyncio.gather(*[
+            extract(complaint, key)
+            for complaint, key in zip(complaints, keys)
+        ])
+
+
+def extract_intents(pairs: list[tuple[str, str]]) -> list[str]:
+    return asyncio.run(extract_intents_batch(pairs))
@@ -1,6 +1,22 @@
+import hashlib
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+# Intra-op threads for the embedder. When running several worker processes
+# (gunicorn/celery) set EMBEDDER_THREADS to cores // workers, otherwise the
+# workers oversubscribe the CPU and get slower, not faster.
+EMBEDDER_THREADS = int(os.environ.get("EMBEDDER_THREADS", os.cpu_count() or 4))
+
+# must be set before torch / onnxruntime are imported
+os.environ.setdefault("OMP_NUM_THREADS", str(EMBEDDER_THREADS))
+os.environ.setdefault("MKL_NUM_THREADS", str(EMBEDDER_THREADS))
+
 import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
-from intent_extractor import extract_intent_or_invalid
+from intent_extractor import extract_intent_or_invalid, extract_intents
 
 
 DEPARTMENTS = {
@@ -13,22 +29,142 @@ DEPARTMENTS = {
 }
 
 
-embedder = SentenceTransformer("all-MiniLM-L6-v2")
+torch.set_num_threads(EMBEDDER_THREADS)
+torch.set_num_interop_threads(1)
+
+# INT8 dynamically quantised export shipped with the MiniLM repo; pick the
+# variant matching the CPU (e.g. onnx/model_qint8_avx2.onnx on older hosts)
+ONNX_MODEL_FILE = os.environ.get(
+    "EMBEDDER_ONNX_FILE",
+    "onnx/model_qint8_avx512_vnni.onnx"
+)
+
+# where computed department embeddings are kept between runs; the source
+# tree may be read-only on a deploy
+EMBED_CACHE_DIR = Path(os.environ.get(
+    "EMBED_CACHE_DIR",
+    Path.home() / ".cache" / "civic_router"
+))
+
+
+@lru_cache(maxsize=None)
+def get_embedder():
+    """Load MiniLM on first use so importers that never route don't pay for it"""
+    try:
+        return SentenceTransformer(
+            "all-MiniLM-L6-v2",
+            backend="onnx",
+            model_kwargs={"file_name": ONNX_MODEL_FILE}
+        )
+    except Exception as e:
+        # onnxruntime / optimum not installed -> plain PyTorch FP32
+        print(f"ONNX embedder unavailable ({e}), falling back to PyTorch")
+        return SentenceTransformer("all-MiniLM-L6-v2")
+
 
 DEPT_TEXTS = list(DEPARTMENTS.values())
 DEPT_IDS = list(DEPARTMENTS.keys())
-DEPT_EMBEDS = embedder.encode(
-    DEPT_TEXTS,
-    normalize_embeddings=True
-)
+
+
+@lru_cache(maxsize=None)
+def get_dept_embeds() -> np.ndarray:
+    """
+    Department embeddings are constant, so they are computed once and kept
+    in EMBED_CACHE_DIR; the name carries a hash of the texts and of the
+    backend that was actually loaded (ONNX file or PyTorch), so editing
+    DEPARTMENTS or falling back to another backend invalidates it.
+    """
+    embedder = get_embedder()
+    model_id = ONNX_MODEL_FILE if embedder.backend == "onnx" else embedder.backend
+    key = hashlib.sha256(
+        "\n".join(DEPT_TEXTS + [model_id]).encode()
+    ).hexdigest()[:12]
+    path = EMBED_CACHE_DIR / f"dept_embeds_{key}.npy"
+
+    if path.exists():
+        return np.load(path)
+
+    embeds = np.ascontiguousarray(
+        embedder.encode(
+            DEPT_TEXTS,
+            normalize_embeddings=True,
+            convert_to_numpy=True
+        ),
+        dtype=np.float32
+    )
+    _save_embeds(path, embeds)
+    return embeds
+
+
+def _save_embeds(path: Path, embeds: np.ndarray):
+    """Write the cache file atomically; a failed write only costs a recompute"""
+    tmp = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # a concurrent reader sees the old file or the whole new one
+        with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".npy", delete=False) as f:
+            tmp = Path(f.name)
+            np.save(f, embeds)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Could not cache department embeddings at {path} ({e})")
+        if tmp is not None:
+            tmp.unlink(missing_ok=True)
+
 
 MIN_CONFIDENCE = 0.45
 MIN_MARGIN = 0.05
 
+EMBED_BATCH_SIZE = 32
+
+
+def embed_many(texts: list[str]) -> np.ndarray:
+    """Encode many texts, batching by token length so each minibatch
+    is only padded to its own longest member."""
+    if not texts:
+        return np.empty((0, get_dept_embeds().shape[1]), dtype=np.float32)
+
+    embedder = get_embedder()
+    lengths = [len(embedder.tokenizer.tokenize(t)) for t in texts]
+    order = np.argsort(lengths, kind="stable")
+
+    sorted_texts = [texts[i] for i in order]
+    sorted_embeds = np.concatenate([
+        embedder.encode(
+            sorted_texts[start:start + EMBED_BATCH_SIZE],
+            batch_size=EMBED_BATCH_SIZE,
+            normalize_embeddings=True,
+            convert_to_numpy=True
+        )
+        for start in range(0, len(sorted_texts), EMBED_BATCH_SIZE)
+    ])
+
+    embeds = np.empty_like(sorted_embeds, dtype=np.float32)
+    embeds[order] = sorted_embeds
+    return embeds
+
 
 def route_issue(title: str, description: str):
     
-    intent = extract_intent_or_invalid(title, description)
+    intent = extract_intent_or_invalid(title, description, embedder=get_embedder())
+
+    return _route_intent(intent)
+
+
+def route_issues(pairs: list[tuple[str, str]]):
+    intents = extract_intents(pairs)
+
+    valid = [i for i, intent in enumerate(intents) if intent.upper() != "INVALID"]
+    embeds = embed_many([intents[i] for i in valid])
+    embed_for = dict(zip(valid, embeds))
+
+    return [
+        _route_intent(intent, embed_for.get(i))
+        for i, intent in enumerate(intents)
+    ]
+
+
+def _route_intent(intent: str, intent_embed=None):
 
     if intent.upper() == "INVALID":
         return {
@@ -37,18 +173,23 @@ def route_issue(title: str, description: str):
         }
 
 
-    intent_embed = embedder.encode(
-        intent,
-        normalize_embeddings=True
-    )
+    if intent_embed is None:
+        intent_embed = get_embedder().encode(
+            intent,
+            normalize_embeddings=True,
+            convert_to_numpy=True
+        ).astype(np.float32)
 
-    sims = np.dot(DEPT_EMBEDS, intent_embed)
+    sims = get_dept_embeds() @ intent_embed
 
-    best_idx = int(np.argmax(sims))
-    best_score = float(sims[best_idx])
+    # top two without a full sort
+    second_idx, best_idx = np.argpartition(sims, -2)[-2:]
+    if sims[second_idx] > sims[best_idx]:
+        second_idx, best_idx = best_idx, second_idx
 
-    sorted_sims = np.sort(sims)
-    margin = sorted_sims[-1] - sorted_sims[-2]
+    best_idx = int(best_idx)
+    best_score = float(sims[best_idx])
+    margin = best_score - float(sims[second_idx])
 
     if best_score < MIN_CONFIDENCE or margin < MIN_MARGIN:
         return {
@@ -67,26 +208,21 @@ def route_issue(title: str, description: str):
     }
 
 
-
-
-
-
-print(1)
-print(route_issue(
-    "big potholes clear urgent",
-    "near bus stop opposite temple"
-))
-
-
-print(2)
-print(route_issue(
-    "asdf qwer zxcv",
-    "123 !!!"
-))
-
-
-print(3)
-print(route_issue(
-    "my dog is missing",
-    "please help"
-))
+if __name__ == "__main__":
+    print(1)
+    print(route_issue(
+        "big potholes clear urgent",
+        "near bus stop opposite temple"
+    ))
+
+    print(2)
+    print(route_issue(
+        "asdf qwer zxcv",
+        "123 !!!"
+    ))
+
+    print(3)
+    print(route_issue(
+        "my dog is missing",
+        "please help"
+    ))
@@ -6,7 +6,7 @@ from .models import BlockchainTransaction, EvidenceHash
 class BlockchainTransactionAdmin(admin.ModelAdmin):
     list_display = ['complaint_id', 'event_type', 'tx_hash', 'block_number', 'timestamp', 'status']
     list_filter = ['event_type', 'status', 'timestamp']
-    search_fields = ['complaint_id', 'tx_hash']
+    search_fields = ['complaint_id', 'tx_hash__exact']
     readonly_fields = ['tx_hash', 'block_number', 'gas_used', 'event_hash', 'timestamp']
 
 
@@ -14,5 +14,5 @@ class BlockchainTransactionAdmin(admin.ModelAdmin):
 class EvidenceHashAdmin(admin.ModelAdmin):
     list_display = ['complaint_id', 'file_name', 'file_path', 'tx_hash', 'verified', 'created_at']
     list_filter = ['verified', 'created_at']
-    search_fields = ['complaint_id', 'file_name', 'file_path', 'tx_hash']
+    search_fields = ['complaint_id', 'file_name', 'file_path', 'tx_hash__exact']
     readonly_fields = ['file_hash', 'file_path', 'tx_hash', 'block_timestamp', 'created_at']
@@ -6,4 +6,5 @@ class BlockchainConfig(AppConfig):
     name = 'blockchain'
     
     def ready(self):
-        import blockchain.signals 
+        import blockchain.signals
+        import blockchain.broker
@@ -0,0 +1,153 @@
+"""
+Async JSON-RPC client for the blockchain node.
+
+Large read batches (receipt polling, event sync, SLA lookups) are split
+into chunks of BLOCKCHAIN_RPC_BATCH_SIZE calls. Posting those chunks one
+after another with requests makes the wall time the sum of every round
+trip; here they are sent concurrently over one aiohttp session, so it is
+roughly the slowest one.
+
+Sync code calls in through run_async(), which hands the coroutine to an
+event loop kept running on a background thread. The loop, and the session
+bound to it, live for the whole worker process instead of being rebuilt
+per call the way asyncio.run()/async_to_sync would.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+from typing import Dict, List, Tuple
+
+import aiohttp
+from django.conf import settings
+
+from .services import rpc_batch_body, rpc_batch_results
+
+logger = logging.getLogger(__name__)
+
+# Seconds an idle keep-alive connection to the node is held open
+KEEPALIVE_TIMEOUT = 75
+
+
+# Per-process event loop thread and the session bound to it
+_loop = None
+_loop_pid = None
+_loop_lock = threading.Lock()
+_session = None
+
+
+def async_available() -> bool:
+    """
+    Whether run_async() can be used in this process.
+    
+    Eventlet workers (the bc_eventlet queue) patch threading and sockets,
+    and an asyncio loop on a green thread would block the hub, so they
+    stay on the sync requests path.
+    """
+    eventlet = sys.modules.get('eventlet')
+    if eventlet is None:
+        return True
+    
+    return not eventlet.patcher.is_monkey_patched('thread')
+
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    try:
+        import uvloop
+        return uvloop.new_event_loop()
+    except ImportError:
+        return asyncio.new_event_loop()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get this process's background event loop, starting it on first use.
+    
+    Prefork children don't inherit the parent's loop thread, so the loop
+    is recreated when the pid changes.
+    """
+    global _loop, _loop_pid, _session
+    
+    pid = os.getpid()
+    if _loop is None or _loop_pid != pid:
+        with _loop_lock:
+            if _loop is None or _loop_pid != pid:
+                loop = _new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever,
+                    name='blockchain-async-rpc',
+                    daemon=True
+                ).start()
+                _session = None
+                _loop, _loop_pid = loop, pid
+    
+    return _loop
+
+
+def run_async(coro, timeout: float = 120):
+    """Run a coroutine on the background loop and wait for its result"""
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop()).result(timeout)
+
+
+def _get_session() -> aiohttp.ClientSession:
+    """Get the loop's pooled session (only called on the loop thread)"""
+    global _session
+    
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=settings.BLOCKCHAIN_HTTP_POOL_SIZE,
+            keepalive_timeout=KEEPALIVE_TIMEOUT
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=60)
+        )
+    
+    return _session
+
+
+async def _post_chunk(chunk: List[Tuple[str, list]]) -> List:
+    async with _get_session().post(
+        settings.BLOCKCHAIN_NODE_URL,
+        json=rpc_batch_body(chunk)
+    ) as response:
+        response.raise_for_status()
+        response_items: List[Dict] = await response.json(content_type=None)
+    
+    return rpc_batch_results(chunk, response_items)
+
+
+async def rpc_batch_async(chunks: List[List[Tuple[str, list]]]) -> List:
+    """
+    Post every chunk of a JSON-RPC batch concurrently.
+    
+    Args:
+        chunks: Lists of (method, params) pairs, one HTTP request each
+    
+    Returns:
+        One result per call, in the original order
+    """
+    chunk_results = await asyncio.gather(*(_post_chunk(chunk) for chunk in chunks))
+    
+    return [result for results in chunk_results for result in results]
+
+
+async def _post_single(call: Tuple[str, list]):
+    async with _get_session().post(
+        settings.BLOCKCHAIN_NODE_URL,
+        json=rpc_batch_body([call])[0]
+    ) as response:
+        response.raise_for_status()
+        response_item: Dict = await response.json(content_type=None)
+    
+    return rpc_batch_results([call], [response_item])[0]
+
+
+async def rpc_each_async(calls: List[Tuple[str, list]]) -> List:
+    """
+    Send each call as its own request, all concurrently (for nodes that
+    reject batches). The session's connector limit caps the concurrency.
+    """
+    return list(await asyncio.gather(*(_post_single(call) for call in calls)))
@@ -0,0 +1,119 @@
+"""
+Buffered Celery task dispatch.
+
+Tasks enqueued while a request is being handled are held until the
+request finishes and then published together over one pooled broker
+connection, instead of each .delay() acquiring its own. Outside a request
+(workers, management commands) tasks are published straight away.
+
+after_response() defers other dispatch work (e.g. Redis de-dup claims)
+the same way, so it runs once the response has been sent.
+"""
+
+import logging
+import threading
+from typing import Callable, Iterable, Optional, Tuple
+
+from celery import current_app
+from django.core.signals import request_finished, request_started
+from django.dispatch import receiver
+
+# Tasks are published with the 'orjson' serializer registered here
+from blockchain import serialization  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+def publish_many(calls: Iterable[Tuple[object, dict]]) -> int:
+    """
+    Publish several task calls with a single producer.
+    
+    Args:
+        calls: (task, kwargs) pairs
+    
+    Returns:
+        Number of tasks published
+    """
+    published = 0
+    with current_app.producer_or_acquire() as producer:
+        for task, kwargs in calls:
+            task.apply_async(kwargs=kwargs, producer=producer)
+            published += 1
+    
+    return published
+
+
+def enqueue(task, on_failure: Optional[Callable[[], None]] = None, **kwargs) -> None:
+    """
+    Queue a task call; published when the current request finishes.
+    
+    Args:
+        task: Celery task
+        on_failure: Called if the task could not be published (e.g. to
+            release a de-dup claim so the dispatch can be retried)
+        **kwargs: Task keyword arguments
+    """
+    pending = getattr(_local, 'pending', None)
+    if pending is None:
+        _publish_pending([(task, kwargs, on_failure)], reraise=True)
+    else:
+        pending.append((task, kwargs, on_failure))
+
+
+def _publish_pending(pending, reraise: bool = False) -> None:
+    """Publish (task, kwargs, on_failure) calls; run on_failure for any not sent"""
+    published = 0
+    try:
+        with current_app.producer_or_acquire() as producer:
+            for task, kwargs, _ in pending:
+                task.apply_async(kwargs=kwargs, producer=producer)
+                published += 1
+    except Exception as e:
+        logger.error("Failed to publish %s of %s buffered tasks: %s", len(pending) - published, len(pending), e)
+        
+        for _, _, on_failure in pending[published:]:
+            if on_failure is None:
+                continue
+            try:
+                on_failure()
+            except Exception as callback_error:
+                logger.error("Publish failure callback failed: %s", callback_error)
+        
+        if reraise:
+            raise
+
+
+def after_response(func, **kwargs) -> None:
+    """Run func(**kwargs) once the current request finishes (now if outside one)"""
+    callbacks = getattr(_local, 'callbacks', None)
+    if callbacks is None:
+        func(**kwargs)
+    else:
+        callbacks.append((func, kwargs))
+
+
+@receiver(request_started)
+def start_buffering(sender, **kwargs):
+    _local.pending = []
+    _local.callbacks = []
+
+
+@receiver(request_finished)
+def flush_buffered_tasks(sender, **kwargs):
+    callbacks = getattr(_local, 'callbacks', None)
+    _local.callbacks = None
+    
+    # Callbacks may enqueue tasks; those join this flush
+    for func, func_kwargs in callbacks or ():
+        try:
+            func(**func_kwargs)
+        except Exception as e:
+            logger.error("Deferred dispatch %s failed: %s", func.__name__, e)
+    
+    pending = getattr(_local, 'pending', None)
+    _local.pending = None
+    
+    if pending:
+        _publish_pending(pending)
@@ -100,7 +100,37 @@ contract ComplaintRegistry {
         string memory complaintId,
         string memory eventType,
         bytes32 eventHash
-    ) external validComplaintId(complaintId) {
+    ) external {
+        _logComplaintEvent(complaintId, eventType, eventHash);
+    }
+    
+    /**
+     * @notice Log several complaint lifecycle events in one transaction
+     * @dev Emits one ComplaintEvent per entry, in order; arrays must be the same length
+     * @param complaintIds Complaint identifiers
+     * @param eventTypes Event type for each complaint
+     * @param eventHashes Keccak256 hash of each off-chain event payload
+     */
+    function batchLogComplaintEvents(
+        string[] memory complaintIds,
+        string[] memory eventTypes,
+        bytes32[] memory eventHashes
+    ) external {
+        require(
+            complaintIds.length == eventTypes.length && complaintIds.length == eventHashes.length,
+            "Array lengths must match"
+        );
+        
+        for (uint256 i = 0; i < complaintIds.length; i++) {
+            _logComplaintEvent(complaintIds[i], eventTypes[i], eventHashes[i]);
+        }
+    }
+    
+    function _logComplaintEvent(
+        string memory complaintId,
+        string memory eventType,
+        bytes32 eventHash
+    ) internal validComplaintId(complaintId) {
         require(bytes(eventType).length > 0, "Event type cannot be empty");
         require(eventHash != bytes32(0), "Event hash cannot be zero");
         
@@ -1,4 +1,5 @@
 from solcx import compile_source, install_solc
+import hashlib
 import json
 import os
 import sys
@@ -7,11 +8,6 @@ from web3 import Web3
 
 
 def compile_contract():
-    try:
-        install_solc('0.8.19')
-    except Exception as e:
-        print(f"Solc already installed or error: {e}")
-    
     contract_path = os.path.join(
         os.path.dirname(__file__),
         'ComplaintRegistry.sol'
@@ -20,6 +16,24 @@ def compile_contract():
     with open(contract_path, 'r') as f:
         contract_source = f.read()
     
+    build_dir = os.path.join(os.path.dirname(__file__), 'build')
+    
+    # Compiled artifacts are cached under the source hash, so an unchanged
+    # contract skips solc (and its install check) entirely
+    src_sha = hashlib.sha256(contract_source.encode()).hexdigest()
+    cache_path = os.path.join(build_dir, f'{src_sha}.json')
+    
+    if os.path.exists(cache_path):
+        with open(cache_path, 'r') as f:
+            contract_interface = json.load(f)
+        print(f"✓ Using cached compilation ({src_sha[:12]})")
+        return contract_interface
+    
+    try:
+        install_solc('0.8.19')
+    except Exception as e:
+        print(f"Solc already installed or error: {e}")
+    
     compiled = compile_source(
         contract_source,
         output_values=['abi', 'bin'],
@@ -28,9 +42,14 @@ def compile_contract():
     
     contract_id, contract_interface = compiled.popitem()
     
-    build_dir = os.path.join(os.path.dirname(__file__), 'build')
     os.makedirs(build_dir, exist_ok=True)
     
+    with open(cache_path, 'w') as f:
+        json.dump(
+            {'abi': contract_interface['abi'], 'bin': contract_interface['bin']},
+            f
+        )
+    
     with open(os.path.join(build_dir, 'ComplaintRegistry_abi.json'), 'w') as f:
         json.dump(contract_interface['abi'], f, indent=2)
     
@@ -0,0 +1,251 @@
+"""
+Redis-backed queue of complaint events waiting to be logged on-chain.
+
+Producers push events here instead of sending one transaction each; the
+flush_pending_events task drains them in batches and logs every batch with
+a single batchLogComplaintEvents transaction.
+
+Draining is a reliable-queue pattern: events are moved (LMOVE) into a
+per-batch processing list and only removed once their rows are stored, so
+a worker killed mid-batch doesn't lose them. Batches left behind longer
+than PROCESSING_TIMEOUT are put back on the pending queue.
+
+Events that fail to send carry an attempt count; after MAX_EVENT_ATTEMPTS
+they are parked on DEAD_EVENTS_KEY for inspection instead of requeued.
+"""
+
+import logging
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+import orjson
+import redis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+PENDING_EVENTS_KEY = 'bc:pending_events'
+FAILED_EVENTS_KEY = 'bc:failed_events'
+DEAD_EVENTS_KEY = 'bc:dead_events'
+PROCESSING_EVENTS_KEY = 'bc:processing_events'
+PROCESSING_BATCHES_KEY = 'bc:processing_batches'
+
+# Seconds before an unacknowledged batch is considered abandoned
+PROCESSING_TIMEOUT = 600
+
+# Failed sends before an event stops being retried
+MAX_EVENT_ATTEMPTS = 5
+
+# How long a dispatch is remembered for de-duplication
+DISPATCH_DEDUPE_TTL = 3600
+
+# Claim the de-dup key and push the event in one round trip; returns 0 when
+# the key was already taken, otherwise the new queue length
+_ENQUEUE_ONCE_LUA = """
+if redis.call('SET', KEYS[2], '1', 'NX', 'EX', ARGV[2]) then
+    return redis.call('LPUSH', KEYS[1], ARGV[1])
+end
+return 0
+"""
+
+# Move up to ARGV[1] of the oldest pending events into a batch list and
+# record when the batch was claimed
+_CLAIM_BATCH_LUA = """
+local events = {}
+for i = 1, tonumber(ARGV[1]) do
+    local event = redis.call('LMOVE', KEYS[1], KEYS[2], 'RIGHT', 'LEFT')
+    if not event then
+        break
+    end
+    events[#events + 1] = event
+end
+if #events > 0 then
+    redis.call('ZADD', KEYS[3], ARGV[2], KEYS[2])
+end
+return events
+"""
+
+# Move every event in a batch list onto another list (oldest first) and
+# forget the batch
+_RELEASE_BATCH_LUA = """
+while redis.call('LMOVE', KEYS[1], KEYS[2], ARGV[1], ARGV[2]) do
+end
+redis.call('ZREM', KEYS[3], KEYS[1])
+"""
+
+
+# Singleton client
+_redis_client = None
+_scripts = {}
+
+
+def get_redis_client() -> redis.Redis:
+    """Get the Redis client used for the event queue"""
+    global _redis_client
+    
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(settings.BLOCKCHAIN_EVENT_QUEUE_URL)
+    
+    return _redis_client
+
+
+def _get_script(lua: str):
+    """Register a Lua script once per process"""
+    script = _scripts.get(lua)
+    
+    if script is None:
+        script = _scripts[lua] = get_redis_client().register_script(lua)
+    
+    return script
+
+
+def enqueue_complaint_event(
+    complaint_id: str,
+    event_type: str,
+    payload: Dict,
+    dedupe_key: Optional[str] = None
+) -> int:
+    """
+    Queue a complaint event for the next batch.
+    
+    Args:
+        complaint_id: Complaint identifier
+        event_type: Event type (CREATED, ASSIGNED, etc.)
+        payload: Event payload to hash and log
+        dedupe_key: If given, the event is only queued if this key hasn't
+            been seen in the last DISPATCH_DEDUPE_TTL seconds
+    
+    Returns:
+        Number of events now waiting, or 0 if the event was a duplicate
+    """
+    event = orjson.dumps({
+        'complaint_id': complaint_id,
+        'event_type': event_type,
+        'payload': payload,
+    })
+    
+    if dedupe_key is None:
+        return get_redis_client().lpush(PENDING_EVENTS_KEY, event)
+    
+    return _get_script(_ENQUEUE_ONCE_LUA)(
+        keys=[PENDING_EVENTS_KEY, dedupe_key],
+        args=[event, DISPATCH_DEDUPE_TTL]
+    )
+
+
+def claim_dispatch(dedupe_key: str) -> bool:
+    """
+    Claim a one-off dispatch (SET NX with a TTL).
+    
+    Returns:
+        True the first time the key is claimed, False for duplicates
+    """
+    return bool(get_redis_client().set(dedupe_key, '1', nx=True, ex=DISPATCH_DEDUPE_TTL))
+
+
+def release_dispatch(dedupe_key: str) -> None:
+    """Drop a claim whose dispatch never went out, so it can be retried"""
+    get_redis_client().delete(dedupe_key)
+
+
+def drain_pending_events(max_batch: int) -> Tuple[Optional[str], List[Dict]]:
+    """
+    Atomically claim up to max_batch of the oldest queued events.
+    
+    The events stay in a processing list until the batch is passed to
+    ack_pending_events or dead_letter_events.
+    
+    Returns:
+        Batch key (None if the queue was empty) and the events in the
+        order they were queued
+    """
+    batch_key = f"{PROCESSING_EVENTS_KEY}:{uuid.uuid4().hex}"
+    
+    raw_events = _get_script(_CLAIM_BATCH_LUA)(
+        keys=[PENDING_EVENTS_KEY, batch_key, PROCESSING_BATCHES_KEY],
+        args=[max_batch, time.time()]
+    )
+    if not raw_events:
+        return None, []
+    
+    return batch_key, [orjson.loads(raw) for raw in raw_events]
+
+
+def ack_pending_events(batch_key: str) -> None:
+    """Drop a claimed batch once its rows are stored"""
+    pipe = get_redis_client().pipeline(transaction=True)
+    pipe.delete(batch_key)
+    pipe.zrem(PROCESSING_BATCHES_KEY, batch_key)
+    pipe.execute()
+
+
+def dead_letter_events(batch_key: str, events: List[Dict]) -> int:
+    """
+    Settle a claimed batch whose events failed to send.
+    
+    Each failed event's attempt count goes up by one; retry_failed_transactions
+    requeues it, or it is parked on DEAD_EVENTS_KEY once it reaches
+    MAX_EVENT_ATTEMPTS. The rest of the batch was stored and is dropped.
+    
+    Returns:
+        Number of events parked for good
+    """
+    retry, dead = [], []
+    for event in events:
+        event = {**event, 'attempts': event.get('attempts', 0) + 1}
+        (dead if event['attempts'] >= MAX_EVENT_ATTEMPTS else retry).append(orjson.dumps(event))
+    
+    pipe = get_redis_client().pipeline(transaction=True)
+    if retry:
+        pipe.lpush(FAILED_EVENTS_KEY, *retry)
+    if dead:
+        pipe.lpush(DEAD_EVENTS_KEY, *dead)
+    pipe.delete(batch_key)
+    pipe.zrem(PROCESSING_BATCHES_KEY, batch_key)
+    pipe.execute()
+    
+    if dead:
+        logger.error("Gave up on %s complaint events after %s attempts", len(dead), MAX_EVENT_ATTEMPTS)
+    
+    return len(dead)
+
+
+def requeue_abandoned_batches(timeout: int = PROCESSING_TIMEOUT) -> int:
+    """
+    Put batches claimed more than timeout seconds ago back on the queue.
+    
+    They belonged to a worker that died before acknowledging them. Events
+    whose rows were stored are skipped by find_logged_event on the resend.
+    
+    Returns:
+        Number of batches requeued
+    """
+    client = get_redis_client()
+    abandoned = client.zrangebyscore(PROCESSING_BATCHES_KEY, '-inf', time.time() - timeout)
+    
+    # Oldest events go back on the consuming end of the queue
+    release = _get_script(_RELEASE_BATCH_LUA)
+    for batch_key in abandoned:
+        release(
+            keys=[batch_key, PENDING_EVENTS_KEY, PROCESSING_BATCHES_KEY],
+            args=['LEFT', 'RIGHT']
+        )
+    
+    return len(abandoned)
+
+
+def requeue_failed_events(limit: int) -> int:
+    """
+    Move up to limit dead-lettered events back onto the pending queue.
+    
+    Returns:
+        Number of events requeued
+    """
+    client = get_redis_client()
+    
+    requeued = 0
+    while requeued < limit and client.lmove(FAILED_EVENTS_KEY, PENDING_EVENTS_KEY, 'RIGHT', 'LEFT'):
+        requeued += 1
+    
+    return requeued
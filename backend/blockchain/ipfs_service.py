@@ -1,15 +1,22 @@
 import logging
 import os
 import hashlib
+import io
+import threading
 import uuid
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import BinaryIO, Dict, List, Tuple, Optional, Union
 from datetime import datetime
 
 from django.conf import settings
 
+from .utils import iter_file_chunks, sha256_stream
+
 logger = logging.getLogger(__name__)
 
+# Read/write/hash evidence in 1 MiB chunks instead of whole-file buffers
+CHUNK_SIZE = 1 << 20
+
 
 class LocalFileStorageService:
     def __init__(self):
@@ -35,11 +42,29 @@ class LocalFileStorageService:
     
     def upload_file(
         self,
-        file_content: bytes,
+        file_content: Union[bytes, BinaryIO],
         file_name: str,
         complaint_id: str = None
     ) -> Tuple[Optional[str], Optional[str]]:
+        file_path, file_url, _ = self.upload_file_with_hash(
+            file_content,
+            file_name,
+            complaint_id=complaint_id
+        )
+        return file_path, file_url
+    
+    def upload_file_with_hash(
+        self,
+        file_content: Union[bytes, BinaryIO],
+        file_name: str,
+        complaint_id: str = None
+    ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """
+        Save a file and return (relative_path, url, sha256_hex).
         
+        Accepts raw bytes or a file-like object (e.g. a Django UploadedFile);
+        the content is streamed to disk and hashed in the same pass.
+        """
         try:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             unique_id = uuid.uuid4().hex[:8]
@@ -55,19 +80,82 @@ class LocalFileStorageService:
                 file_full_path = self.upload_dir / safe_name
                 file_relative_path = f"uploads/{safe_name}"
             
-            with open(file_full_path, 'wb') as f:
-                f.write(file_content)
+            if isinstance(file_content, (bytes, bytearray)):
+                file_content = io.BytesIO(file_content)
+            
+            # Large uploads are already on disk; move them instead of copying
+            file_hash = self._move_temporary_upload(file_content, file_full_path)
+            if file_hash is None:
+                file_hash = self._write_and_hash(file_content, file_full_path)
             
             logger.info(f"File saved locally: {file_full_path}")
             
             media_url = getattr(settings, 'MEDIA_URL', '/media/')
             file_url = f"{media_url}{file_relative_path}"
             
-            return file_relative_path, file_url
+            return file_relative_path, file_url, file_hash
             
         except Exception as e:
             logger.error(f"Local file upload error: {e}")
-            return None, None
+            return None, None, None
+    
+    def _move_temporary_upload(self, src, dst_path: Path) -> Optional[str]:
+        """
+        Hash a disk-backed upload (TemporaryUploadedFile) and rename it into
+        place, so its bytes are read once and never rewritten.
+        
+        Returns None, leaving the upload untouched, when src isn't on disk or
+        its temp directory is on another filesystem (FILE_UPLOAD_TEMP_DIR);
+        the caller then copies it with _write_and_hash.
+        """
+        if not hasattr(src, 'temporary_file_path'):
+            return None
+        
+        src_path = src.temporary_file_path()
+        if os.stat(src_path).st_dev != os.stat(dst_path.parent).st_dev:
+            return None
+        
+        with open(src_path, 'rb') as f:
+            file_hash = sha256_stream(f)
+            # Django doesn't sync upload temp files; do it before publishing
+            os.fsync(f.fileno())
+        
+        os.rename(src_path, dst_path)
+        
+        # Temp files are created 0600; match what FileSystemStorage would set
+        permissions = getattr(settings, 'FILE_UPLOAD_PERMISSIONS', None)
+        if permissions is not None:
+            os.chmod(dst_path, permissions)
+        
+        return file_hash
+    
+    def _write_and_hash(self, src: BinaryIO, dst_path: Path) -> str:
+        """
+        Write to a .part file and atomically rename it into place, so a crash
+        mid-write never leaves a truncated file under the final name.
+        """
+        file_hash = hashlib.sha256()
+        tmp_path = dst_path.with_suffix(dst_path.suffix + '.part')
+        
+        try:
+            with open(tmp_path, 'wb', buffering=CHUNK_SIZE) as out:
+                if hasattr(os, 'posix_fadvise'):
+                    os.posix_fadvise(out.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                
+                for chunk in iter_file_chunks(src, CHUNK_SIZE):
+                    out.write(chunk)
+                    file_hash.update(chunk)
+                
+                out.flush()
+                os.fsync(out.fileno())
+            
+            os.replace(tmp_path, dst_path)
+            
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        
+        return file_hash.hexdigest()
     
     def retrieve_file(self, file_path: str) -> Optional[bytes]:
         try:
@@ -95,6 +183,11 @@ class LocalFileStorageService:
         media_url = getattr(settings, 'MEDIA_URL', '/media/')
         return f"{media_url}{file_path}"
     
+    def get_file_urls_bulk(self, file_paths: List[str]) -> Dict[str, str]:
+        """Map each file path to its URL, reading MEDIA_URL once"""
+        media_url = getattr(settings, 'MEDIA_URL', '/media/')
+        return {file_path: media_url + file_path for file_path in file_paths}
+    
     def verify_file_exists(self, file_path: str) -> bool:
         try:
             if file_path.startswith('uploads/'):
@@ -129,19 +222,25 @@ class LocalFileStorageService:
             logger.error(f"File deletion error: {e}")
             return False
     
-    def compute_file_hash(self, file_content: bytes) -> str:
-        return hashlib.sha256(file_content).hexdigest()
+    def compute_file_hash(self, file_content: Union[bytes, BinaryIO]) -> str:
+        if isinstance(file_content, (bytes, bytearray)):
+            return hashlib.sha256(file_content).hexdigest()
+        
+        return sha256_stream(file_content)
 
 
 # Singleton instance
 _local_storage_service = None
+_local_storage_service_lock = threading.Lock()
 
 
 def get_local_storage_service() -> LocalFileStorageService:
     global _local_storage_service
     
     if _local_storage_service is None:
-        _local_storage_service = LocalFileStorageService()
+        with _local_storage_service_lock:
+            if _local_storage_service is None:
+                _local_storage_service = LocalFileStorageService()
     
     return _local_storage_service
 
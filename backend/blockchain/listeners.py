@@ -1,16 +1,21 @@
+import asyncio
 import logging
+from collections import defaultdict
+from functools import lru_cache
 from typing import Dict, List
 from datetime import datetime
 
+from django.db import connection, transaction
 from django.utils import timezone
-from web3 import Web3
+from eth_utils import event_abi_to_log_topic
+from web3 import AsyncWeb3, Web3
+from web3.providers import WebsocketProviderV2
 
-from .services import get_blockchain_service
-from .models import BlockchainTransaction, SLATracker
+from .services import get_blockchain_service, rpc_batch
+from .models import BlockchainTransaction, EvidenceHash, SLATracker
 
 logger = logging.getLogger(__name__)
 
-
 def sync_events_from_blockchain(
     from_block: int = None,
     to_block: int = None
@@ -24,12 +29,12 @@ def sync_events_from_blockchain(
         
         if from_block is None:
             # Get last synced block from database
-            last_tx = BlockchainTransaction.objects.filter(
+            last_block = BlockchainTransaction.objects.filter(
                 status='CONFIRMED'
-            ).order_by('-block_number').first()
+            ).order_by('-block_number').values_list('block_number', flat=True).first()
             
-            if last_tx and last_tx.block_number:
-                from_block = last_tx.block_number + 1
+            if last_block:
+                from_block = last_block + 1
             else:
                 # Default to last 1000 blocks if no data
                 from_block = max(0, to_block - 1000)
@@ -44,21 +49,9 @@ def sync_events_from_blockchain(
             'errors': 0
         }
         
-        # Sync ComplaintEvent
-        complaint_events = sync_complaint_events(service, from_block, to_block)
-        stats['complaint_events'] = len(complaint_events)
-        
-        # Sync EvidenceAnchored
-        evidence_events = sync_evidence_events(service, from_block, to_block)
-        stats['evidence_events'] = len(evidence_events)
-        
-        # Sync ComplaintEscalated
-        escalation_events = sync_escalation_events(service, from_block, to_block)
-        stats['escalation_events'] = len(escalation_events)
-        
-        # Sync SLADeadlineSet
-        sla_events = sync_sla_events(service, from_block, to_block)
-        stats['sla_events'] = len(sla_events)
+        # All four event types come back from a single eth_getLogs call
+        events = fetch_contract_events(service, from_block, to_block)
+        stats.update(persist_contract_events(service, events))
         
         logger.info(f"Sync complete: {stats}")
         return stats
@@ -68,182 +61,317 @@ def sync_events_from_blockchain(
         return {'error': str(e)}
 
 
-def sync_complaint_events(service, from_block: int, to_block: int) -> List[Dict]:
+@lru_cache(maxsize=4096)
+def block_time_to_datetime(timestamp: int) -> datetime:
+    """
+    Unix block time -> aware UTC datetime.
+    
+    Events mined in the same block share a timestamp, so a sync builds
+    one datetime per block instead of one per event.
+    """
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+SYNCED_EVENTS = (
+    'ComplaintEvent',
+    'EvidenceAnchored',
+    'ComplaintEscalated',
+    'SLADeadlineSet',
+)
+
+
+def fetch_contract_events(service, from_block: int, to_block: int) -> Dict[str, List]:
+    """
+    Fetch every synced event type in the block range with one eth_getLogs.
+    
+    The topic0 slot is an OR-list of the event signatures; logs are then
+    decoded client-side by topic. Returns {event_name: [decoded events]}.
+    """
+    decoders = {}
+    for event_name in SYNCED_EVENTS:
+        event = getattr(service.contract.events, event_name)()
+        decoders[Web3.to_hex(event_abi_to_log_topic(event.abi))] = (event_name, event)
+    
+    logs = service.w3.eth.get_logs({
+        'address': service.contract.address,
+        'fromBlock': from_block,
+        'toBlock': to_block,
+        'topics': [list(decoders)]
+    })
+    
+    events = {event_name: [] for event_name in SYNCED_EVENTS}
+    for log in logs:
+        event_name, event = decoders[Web3.to_hex(log['topics'][0])]
+        events[event_name].append(event.process_log(log))
+    
+    return events
+
+
+def persist_contract_events(service, events: Dict[str, List]) -> Dict[str, int]:
+    """
+    Write decoded events ({event_name: [events]}) to the database.
+    
+    All event types are written in one transaction, SLA deadlines before
+    escalations so the escalation sync sees the trackers they create. Any
+    failure rolls the whole range back and is raised, so the range is
+    synced again rather than skipped.
+    
+    Returns:
+        Number of events synced per stats key
+    """
+    syncers = [
+        ('complaint_events', sync_complaint_events, 'ComplaintEvent'),
+        ('evidence_events', sync_evidence_events, 'EvidenceAnchored'),
+        ('sla_events', sync_sla_events, 'SLADeadlineSet'),
+        ('escalation_events', sync_escalation_events, 'ComplaintEscalated'),
+    ]
+    
+    stats = {}
+    with transaction.atomic():
+        for name, syncer, event_name in syncers:
+            if events.get(event_name):
+                stats[name] = len(syncer(service, events[event_name]))
+    
+    return stats
+
+
+def bulk_upsert(model, objs: List, unique_fields: List[str], update_fields: List[str]):
+    """
+    INSERT ... ON CONFLICT/ON DUPLICATE KEY UPDATE in a single statement.
+    
+    MySQL resolves the conflict from any unique key and rejects an
+    explicit conflict target, so unique_fields is only passed to backends
+    that support it (PostgreSQL, SQLite).
+    """
+    if not objs:
+        return []
+    
+    kwargs = {'update_conflicts': True, 'update_fields': update_fields}
+    if connection.features.supports_update_conflicts_with_target:
+        kwargs['unique_fields'] = unique_fields
+    
+    return model.objects.bulk_create(objs, **kwargs)
+
+
+def fetch_gas_used(service, tx_hashes) -> Dict[str, int]:
+    """Fetch receipts with batched JSON-RPC and map tx_hash -> gasUsed"""
+    tx_hashes = list(tx_hashes)
+    if not tx_hashes:
+        return {}
+    
+    receipts = rpc_batch([
+        ('eth_getTransactionReceipt', [tx_hash]) for tx_hash in tx_hashes
+    ])
+    return {
+        tx_hash: int(receipt['gasUsed'], 16)
+        for tx_hash, receipt in zip(tx_hashes, receipts)
+    }
+
+
+def sync_complaint_events(service, events: List) -> List[Dict]:
     """Sync ComplaintEvent emissions"""
-    try:
-        event_filter = service.contract.events.ComplaintEvent.create_filter(
-            fromBlock=from_block,
-            toBlock=to_block
-        )
-        
-        events = event_filter.get_all_entries()
-        
-        for event in events:
-            complaint_id = event['args']['complaintId']
-            event_type = event['args']['eventType']
-            event_hash = event['args']['eventHash'].hex()
-            timestamp = event['args']['timestamp']
-            
-            tx_hash = event['transactionHash'].hex()
-            block_number = event['blockNumber']
-            
-            # Check if already exists
-            if BlockchainTransaction.objects.filter(tx_hash=tx_hash).exists():
-                continue
-            
-            # Get transaction receipt for gas info
-            tx_receipt = service.w3.eth.get_transaction_receipt(tx_hash)
-            
-            # Create or update
-            BlockchainTransaction.objects.update_or_create(
-                tx_hash=tx_hash,
-                defaults={
-                    'complaint_id': complaint_id,
-                    'event_type': event_type,
-                    'event_hash': event_hash,
-                    'block_number': block_number,
-                    'gas_used': tx_receipt['gasUsed'],
-                    'status': 'CONFIRMED',
-                    'timestamp': datetime.fromtimestamp(timestamp, tz=timezone.utc),
-                    'event_payload': {}  # We don't have the original payload
-                }
-            )
-            
-            logger.info(f"Synced complaint event: {complaint_id} - {event_type}")
-        
-        return events
+    # A batched transaction emits several ComplaintEvents; number them
+    # in log order to match the event_index the sender stored
+    keys = []
+    per_tx = defaultdict(int)
+    for event in events:
+        tx_hash = event['transactionHash'].hex()
+        keys.append((tx_hash, per_tx[tx_hash]))
+        per_tx[tx_hash] += 1
+    
+    # Only fetch receipts for events we haven't stored yet,
+    # checked against the database in a single query
+    existing = set(
+        BlockchainTransaction.objects.filter(
+            tx_hash__in=per_tx.keys()
+        ).values_list('tx_hash', 'event_index')
+    )
+    new_keys = set(keys) - existing
+    
+    # Get transaction receipts for gas info, batched per request
+    gas_used = fetch_gas_used(service, {tx_hash for tx_hash, _ in new_keys})
+    
+    to_upsert = []
+    
+    for event, key in zip(events, keys):
+        if key not in new_keys:
+            continue
+        new_keys.discard(key)
         
-    except Exception as e:
-        logger.error(f"Failed to sync complaint events: {e}")
-        return []
+        complaint_id = event['args']['complaintId']
+        event_type = event['args']['eventType']
+        event_hash = event['args']['eventHash'].hex()
+        timestamp = event['args']['timestamp']
+        
+        tx_hash, event_index = key
+        block_number = event['blockNumber']
+        
+        to_upsert.append(BlockchainTransaction(
+            tx_hash=tx_hash,
+            event_index=event_index,
+            complaint_id=complaint_id,
+            event_type=event_type,
+            event_hash=event_hash,
+            block_number=block_number,
+            gas_used=gas_used.get(tx_hash),
+            status='CONFIRMED',
+            timestamp=block_time_to_datetime(timestamp),
+            event_payload={}  # We don't have the original payload
+        ))
+        
+        logger.info(f"Synced complaint event: {complaint_id} - {event_type}")
+    
+    # Create or update
+    bulk_upsert(
+        BlockchainTransaction,
+        to_upsert,
+        unique_fields=['tx_hash', 'event_index'],
+        # event_payload is left alone: the sender's row has the real one
+        update_fields=[
+            'complaint_id', 'event_type', 'event_hash', 'block_number',
+            'gas_used', 'status', 'timestamp'
+        ]
+    )
+    
+    return events
 
 
-def sync_evidence_events(service, from_block: int, to_block: int) -> List[Dict]:
+def sync_evidence_events(service, events: List) -> List[Dict]:
     """Sync EvidenceAnchored emissions"""
-    try:
-        event_filter = service.contract.events.EvidenceAnchored.create_filter(
-            fromBlock=from_block,
-            toBlock=to_block
-        )
-        
-        events = event_filter.get_all_entries()
+    anchored = {}
+    
+    for event in events:
+        complaint_id = event['args']['complaintId']
+        # EvidenceHash.file_hash comes back unprefixed (HashField(prefixed=False))
+        evidence_hash = event['args']['evidenceHash'].hex().removeprefix('0x')
+        timestamp = event['args']['timestamp']
         
-        for event in events:
-            complaint_id = event['args']['complaintId']
-            evidence_hash = event['args']['evidenceHash'].hex()
-            timestamp = event['args']['timestamp']
-            
-            tx_hash = event['transactionHash'].hex()
-            
-            # Update evidence record if exists
-            from .models import EvidenceHash
-            
-            EvidenceHash.objects.filter(
-                complaint_id=complaint_id,
-                file_hash=evidence_hash
-            ).update(
-                block_timestamp=timestamp,
-                verified=True
-            )
-            
-            logger.info(f"Synced evidence event: {complaint_id} - {evidence_hash[:16]}...")
+        anchored[(complaint_id, evidence_hash)] = timestamp
         
-        return events
+        logger.info(f"Synced evidence event: {complaint_id} - {evidence_hash[:16]}...")
+    
+    # Update evidence records if they exist
+    if anchored:
+        records = EvidenceHash.objects.filter(
+            complaint_id__in={key[0] for key in anchored},
+            file_hash__in={key[1] for key in anchored}
+        )
         
-    except Exception as e:
-        logger.error(f"Failed to sync evidence events: {e}")
-        return []
+        to_update = []
+        for evidence in records:
+            key = (evidence.complaint_id, evidence.file_hash)
+            if key in anchored:
+                evidence.block_timestamp = anchored[key]
+                evidence.verified = True
+                to_update.append(evidence)
+        
+        EvidenceHash.objects.bulk_update(
+            to_update,
+            ['block_timestamp', 'verified']
+        )
+    
+    return events
 
 
-def sync_escalation_events(service, from_block: int, to_block: int) -> List[Dict]:
+def sync_escalation_events(service, events: List) -> List[Dict]:
     """Sync ComplaintEscalated emissions"""
-    try:
-        event_filter = service.contract.events.ComplaintEscalated.create_filter(
-            fromBlock=from_block,
-            toBlock=to_block
+    escalations = {}
+    # A batch escalation emits several events from one tx; keyed on
+    # tx_hash so the upsert never touches the same row twice
+    transactions = {}
+    
+    for event in events:
+        complaint_id = event['args']['complaintId']
+        deadline = event['args']['deadline']
+        escalation_time = event['args']['escalationTime']
+        
+        tx_hash = event['transactionHash'].hex()
+        escalated_at = block_time_to_datetime(escalation_time)
+        
+        escalations[complaint_id] = (tx_hash, escalated_at)
+        
+        # Also log as blockchain transaction
+        transactions[tx_hash] = BlockchainTransaction(
+            tx_hash=tx_hash,
+            complaint_id=complaint_id,
+            event_type='ESCALATED',
+            event_hash='',
+            block_number=event['blockNumber'],
+            status='CONFIRMED',
+            timestamp=escalated_at,
+            event_payload={
+                'deadline': deadline,
+                'escalation_time': escalation_time
+            }
         )
         
-        events = event_filter.get_all_entries()
-        
-        for event in events:
-            complaint_id = event['args']['complaintId']
-            deadline = event['args']['deadline']
-            escalation_time = event['args']['escalationTime']
-            
-            tx_hash = event['transactionHash'].hex()
-            
-            # Update SLA tracker
-            SLATracker.objects.update_or_create(
-                complaint_id=complaint_id,
-                defaults={
-                    'escalated': True,
-                    'escalation_tx_hash': tx_hash,
-                    'escalation_timestamp': datetime.fromtimestamp(
-                        escalation_time,
-                        tz=timezone.utc
-                    )
-                }
-            )
-            
-            # Also log as blockchain transaction
-            BlockchainTransaction.objects.update_or_create(
-                tx_hash=tx_hash,
-                defaults={
-                    'complaint_id': complaint_id,
-                    'event_type': 'ESCALATED',
-                    'event_hash': '',
-                    'block_number': event['blockNumber'],
-                    'status': 'CONFIRMED',
-                    'timestamp': datetime.fromtimestamp(
-                        escalation_time,
-                        tz=timezone.utc
-                    ),
-                    'event_payload': {
-                        'deadline': deadline,
-                        'escalation_time': escalation_time
-                    }
-                }
-            )
-            
-            logger.warning(f"Synced escalation event: {complaint_id}")
-        
-        return events
-        
-    except Exception as e:
-        logger.error(f"Failed to sync escalation events: {e}")
-        return []
+        logger.warning(f"Synced escalation event: {complaint_id}")
+    
+    # Update SLA trackers (a tracker without a deadline can't be created)
+    trackers = list(SLATracker.objects.filter(complaint_id__in=escalations))
+    for tracker in trackers:
+        tracker.escalated = True
+        tracker.escalation_tx_hash, tracker.escalation_timestamp = escalations[tracker.complaint_id]
+    
+    SLATracker.objects.bulk_update(
+        trackers,
+        ['escalated', 'escalation_tx_hash', 'escalation_timestamp']
+    )
+    bulk_upsert(
+        BlockchainTransaction,
+        list(transactions.values()),
+        unique_fields=['tx_hash', 'event_index'],
+        update_fields=[
+            'complaint_id', 'event_type', 'event_hash', 'block_number',
+            'status', 'timestamp', 'event_payload'
+        ]
+    )
+    
+    return events
 
 
-def sync_sla_events(service, from_block: int, to_block: int) -> List[Dict]:
+def sync_sla_events(service, events: List) -> List[Dict]:
     """Sync SLADeadlineSet emissions"""
-    try:
-        event_filter = service.contract.events.SLADeadlineSet.create_filter(
-            fromBlock=from_block,
-            toBlock=to_block
-        )
-        
-        events = event_filter.get_all_entries()
-        
-        for event in events:
-            complaint_id = event['args']['complaintId']
-            deadline = event['args']['deadline']
-            
-            SLATracker.objects.update_or_create(
-                complaint_id=complaint_id,
-                defaults={
-                    'sla_deadline': deadline
-                }
-            )
-            
-            logger.info(f"Synced SLA event: {complaint_id} - deadline: {deadline}")
+    deadlines = {}
+    
+    for event in events:
+        complaint_id = event['args']['complaintId']
+        deadline = event['args']['deadline']
         
-        return events
+        deadlines[complaint_id] = deadline
         
-    except Exception as e:
-        logger.error(f"Failed to sync SLA events: {e}")
-        return []
+        logger.info(f"Synced SLA event: {complaint_id} - deadline: {deadline}")
+    
+    bulk_upsert(
+        SLATracker,
+        [
+            SLATracker(complaint_id=complaint_id, sla_deadline=deadline)
+            for complaint_id, deadline in deadlines.items()
+        ],
+        unique_fields=['complaint_id'],
+        update_fields=['sla_deadline']
+    )
+    
+    return events
+
+# A block's logs are persisted together once a later block shows up, or
+# after this many idle seconds
+LISTENER_FLUSH_IDLE_SECONDS = 2
+
+# Tries at writing a block before it is left for a manual re-sync
+LISTENER_PERSIST_ATTEMPTS = 3
+
 
 class BlockchainEventListener:
+    """
+    Persist contract events as they are mined, pushed over eth_subscribe.
+    
+    Logs are written with the same sync_* helpers the polling sync uses,
+    one block at a time, so a batched transaction's ComplaintEvents are
+    numbered together. sync_blockchain_events still runs (hourly) to
+    reconcile anything missed while the socket was down.
+    """
+    
     def __init__(self):
         from django.conf import settings
         
@@ -253,56 +381,104 @@ class BlockchainEventListener:
         if not ws_url:
             raise ValueError("BLOCKCHAIN_WS_URL not configured")
         
-        from web3 import Web3
-        self.w3 = Web3(Web3.WebsocketProvider(ws_url))
+        self.ws_url = ws_url
         
-        service = get_blockchain_service()
-        self.contract = service.contract
+        self.service = get_blockchain_service()
+        self.contract = self.service.contract
+        
+        # topic0 -> (event name, event decoder)
+        self.decoders = {}
+        for event_name in SYNCED_EVENTS:
+            event = getattr(self.contract.events, event_name)()
+            self.decoders[Web3.to_hex(event_abi_to_log_topic(event.abi))] = (event_name, event)
     
     def start(self):
         logger.info("Starting real-time event listener...")
         
-        complaint_filter = self.contract.events.ComplaintEvent.create_filter(
-            fromBlock='latest'
-        )
-        
-        escalation_filter = self.contract.events.ComplaintEscalated.create_filter(
-            fromBlock='latest'
-        )
-        
+        try:
+            asyncio.run(self.start_async())
+        except KeyboardInterrupt:
+            logger.info("Stopping event listener...")
+    
+    async def start_async(self):
+        """Receive logs pushed over eth_subscribe instead of polling filters"""
         while True:
+            logs = asyncio.Queue()
+            reader = None
             try:
-                for event in complaint_filter.get_new_entries():
-                    self._handle_complaint_event(event)
-                
-                for event in escalation_filter.get_new_entries():
-                    self._handle_escalation_event(event)
-                
-                import time
-                time.sleep(2)
+                async with AsyncWeb3.persistent_websocket(
+                    WebsocketProviderV2(self.ws_url)
+                ) as w3:
+                    await w3.eth.subscribe('logs', {
+                        'address': self.contract.address,
+                        'topics': [list(self.decoders)]
+                    })
+                    
+                    reader = asyncio.ensure_future(self._read_logs(w3, logs))
+                    await self._persist_blocks(logs, reader)
                 
-            except KeyboardInterrupt:
-                logger.info("Stopping event listener...")
-                break
             except Exception as e:
                 logger.error(f"Event listener error: {e}")
-                import time
-                time.sleep(10)
+                await asyncio.sleep(10)
+            finally:
+                if reader is not None:
+                    reader.cancel()
     
-    def _handle_complaint_event(self, event):
-        """Handle ComplaintEvent"""
-        complaint_id = event['args']['complaintId']
-        event_type = event['args']['eventType']
+    async def _read_logs(self, w3, logs: asyncio.Queue):
+        async for response in w3.ws.process_subscriptions():
+            await logs.put(response['result'])
+    
+    async def _persist_blocks(self, logs: asyncio.Queue, reader: asyncio.Future):
+        """Group incoming logs by block and persist each block as it completes"""
+        block_number = None
+        events = defaultdict(list)
+        
+        while not reader.done():
+            try:
+                log = await asyncio.wait_for(logs.get(), LISTENER_FLUSH_IDLE_SECONDS)
+            except asyncio.TimeoutError:
+                log = None
+            
+            if events and (log is None or log['blockNumber'] != block_number):
+                await self._flush(events)
+                events = defaultdict(list)
+            
+            if log is None or log.get('removed'):
+                continue
+            
+            event_name, event = self.decoders[Web3.to_hex(log['topics'][0])]
+            events[event_name].append(event.process_log(log))
+            block_number = log['blockNumber']
         
-        logger.info(f"📥 Real-time event: {complaint_id} - {event_type}")
+        if events:
+            await self._flush(events)
         
-        # Trigger any real-time actions (notifications, webhooks, etc.)
+        # Surface the socket error to start_async so it reconnects
+        reader.result()
     
-    def _handle_escalation_event(self, event):
-        """Handle ComplaintEscalated"""
-        complaint_id = event['args']['complaintId']
+    async def _flush(self, events: Dict[str, List]):
+        # The ORM is sync-only; run the writes off the event loop. A failed
+        # write leaves nothing behind, so the same block is simply retried
+        for attempt in range(1, LISTENER_PERSIST_ATTEMPTS + 1):
+            try:
+                stats = await asyncio.to_thread(persist_contract_events, self.service, events)
+                break
+            except Exception as e:
+                logger.error(f"Real-time sync failed (attempt {attempt}): {e}")
+                if attempt < LISTENER_PERSIST_ATTEMPTS:
+                    await asyncio.sleep(attempt * 2)
+        else:
+            block_number = next(iter(events.values()))[0]['blockNumber']
+            logger.error(
+                f"Giving up on block {block_number}; re-sync it with "
+                f"manage.py sync_blockchain_events --from-block {block_number} --to-block {block_number}"
+            )
+            return
+        
+        for event in events.get('ComplaintEscalated', ()):
+            logger.warning(f"🚨 Real-time escalation: {event['args']['complaintId']}")
         
-        logger.warning(f"🚨 Real-time escalation: {complaint_id}")
+        logger.info(f"📥 Real-time sync: {stats}")
         
 
 def run_event_listener_daemon():
@@ -1,4 +1,5 @@
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.utils import timezone
 from blockchain.services import get_blockchain_service
 from blockchain.models import SLATracker
@@ -32,53 +33,60 @@ class Command(BaseCommand):
             self.stdout.write(self.style.NOTICE('DRY RUN MODE - No blockchain transactions'))
         
         try:
-            current_timestamp = int(time.time())
-            trackers = SLATracker.objects.filter(
-                escalated=False,
-                sla_deadline__lte=current_timestamp
-            )[:limit]
-            
-            if not trackers.exists():
-                self.stdout.write(self.style.SUCCESS('✓ No SLA violations found'))
-                return
-            
-            self.stdout.write(
-                self.style.WARNING(f'Found {trackers.count()} complaints past deadline')
-            )
-            
-            for tracker in trackers:
-                deadline_dt = timezone.datetime.fromtimestamp(
-                    tracker.sla_deadline,
-                    tz=timezone.utc
+            # Claim a disjoint chunk of overdue trackers: rows locked by another
+            # check_sla worker are skipped, and the locks are held until the
+            # escalation is recorded so no complaint is escalated twice
+            with transaction.atomic():
+                current_timestamp = int(time.time())
+                # One query, served by the (escalated, sla_deadline) index
+                trackers = list(
+                    SLATracker.objects.select_for_update(skip_locked=True).filter(
+                        escalated=False,
+                        sla_deadline__lte=current_timestamp
+                    ).only('complaint_id', 'sla_deadline').order_by('sla_deadline')[:limit]
                 )
-                hours_overdue = (current_timestamp - tracker.sla_deadline) / 3600
+                
+                if not trackers:
+                    self.stdout.write(self.style.SUCCESS('✓ No SLA violations found'))
+                    return
                 
                 self.stdout.write(
-                    f'  • {tracker.complaint_id} - '
-                    f'Deadline: {deadline_dt.strftime("%Y-%m-%d %H:%M")} - '
-                    f'Overdue: {hours_overdue:.1f}h'
-                )
-            
-            if dry_run:
-                return
-            
-            self.stdout.write(self.style.WARNING('Escalating on blockchain...'))
-            
-            service = get_blockchain_service()
-            complaint_ids = [t.complaint_id for t in trackers]
-            
-            escalated_count = service.batch_check_and_escalate(complaint_ids)
-            
-            if escalated_count > 0:
-                self.stdout.write(
-                    self.style.ERROR(f'🚨 Escalated {escalated_count} complaints')
-                )
-            else:
-                self.stdout.write(
-                    self.style.WARNING('No new escalations (already escalated on-chain)')
+                    self.style.WARNING(f'Found {len(trackers)} complaints past deadline')
                 )
-            
-            self.stdout.write(self.style.SUCCESS('✓ SLA check complete'))
+                
+                for tracker in trackers:
+                    deadline_dt = timezone.datetime.fromtimestamp(
+                        tracker.sla_deadline,
+                        tz=timezone.utc
+                    )
+                    hours_overdue = (current_timestamp - tracker.sla_deadline) / 3600
+                    
+                    self.stdout.write(
+                        f'  • {tracker.complaint_id} - '
+                        f'Deadline: {deadline_dt.strftime("%Y-%m-%d %H:%M")} - '
+                        f'Overdue: {hours_overdue:.1f}h'
+                    )
+                
+                if dry_run:
+                    return
+                
+                self.stdout.write(self.style.WARNING('Escalating on blockchain...'))
+                
+                service = get_blockchain_service()
+                complaint_ids = [t.complaint_id for t in trackers]
+                
+                escalated_count = service.batch_check_and_escalate(complaint_ids)
+                
+                if escalated_count > 0:
+                    self.stdout.write(
+                        self.style.ERROR(f'🚨 Escalated {escalated_count} complaints')
+                    )
+                else:
+                    self.stdout.write(
+                        self.style.WARNING('No new escalations (already escalated on-chain)')
+                    )
+                
+                self.stdout.write(self.style.SUCCESS('✓ SLA check complete'))
             
         except Exception as e:
             self.stdout.write(
@@ -0,0 +1,17 @@
+import blockchain.utils
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='blockchaintransaction',
+            name='event_payload',
+            field=models.JSONField(encoder=blockchain.utils.OrjsonEncoder, help_text='Original event data that was hashed'),
+        ),
+    ]
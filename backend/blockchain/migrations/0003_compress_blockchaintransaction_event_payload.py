@@ -0,0 +1,64 @@
+import blockchain.utils
+from django.db import migrations
+
+
+def copy_payloads(apps, schema_editor):
+    BlockchainTransaction = apps.get_model('blockchain', 'BlockchainTransaction')
+    
+    batch = []
+    for tx in BlockchainTransaction.objects.only('id', 'event_payload').iterator(chunk_size=1000):
+        tx.event_payload_blob = tx.event_payload
+        batch.append(tx)
+        
+        if len(batch) >= 1000:
+            BlockchainTransaction.objects.bulk_update(batch, ['event_payload_blob'])
+            batch = []
+    
+    if batch:
+        BlockchainTransaction.objects.bulk_update(batch, ['event_payload_blob'])
+
+
+def restore_payloads(apps, schema_editor):
+    BlockchainTransaction = apps.get_model('blockchain', 'BlockchainTransaction')
+    
+    batch = []
+    for tx in BlockchainTransaction.objects.only('id', 'event_payload_blob').iterator(chunk_size=1000):
+        tx.event_payload = tx.event_payload_blob
+        batch.append(tx)
+        
+        if len(batch) >= 1000:
+            BlockchainTransaction.objects.bulk_update(batch, ['event_payload'])
+            batch = []
+    
+    if batch:
+        BlockchainTransaction.objects.bulk_update(batch, ['event_payload'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0002_alter_blockchaintransaction_event_payload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blockchaintransaction',
+            name='event_payload_blob',
+            field=blockchain.utils.CompressedJSONField(null=True),
+        ),
+        migrations.RunPython(copy_payloads, restore_payloads),
+        migrations.RemoveField(
+            model_name='blockchaintransaction',
+            name='event_payload',
+        ),
+        migrations.RenameField(
+            model_name='blockchaintransaction',
+            old_name='event_payload_blob',
+            new_name='event_payload',
+        ),
+        migrations.AlterField(
+            model_name='blockchaintransaction',
+            name='event_payload',
+            field=blockchain.utils.CompressedJSONField(help_text='Original event data that was hashed'),
+        ),
+    ]
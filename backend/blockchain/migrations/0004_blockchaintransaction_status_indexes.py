@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0003_compress_blockchaintransaction_event_payload'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blockchaintransaction',
+            index=models.Index(fields=['status', 'timestamp'], name='blockchain__status_690adf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blockchaintransaction',
+            index=models.Index(fields=['status', '-block_number'], name='blockchain__status_3beb1a_idx'),
+        ),
+    ]
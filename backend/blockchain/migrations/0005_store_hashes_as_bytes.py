@@ -0,0 +1,144 @@
+import blockchain.utils
+from django.db import migrations
+
+
+# Hex hash columns per model, converted to raw bytes
+HASH_FIELDS = {
+    'blockchaintransaction': ['event_hash', 'tx_hash'],
+    'evidencehash': ['file_hash', 'tx_hash'],
+    'slatracker': ['escalation_tx_hash'],
+}
+
+
+def _copy_hashes(apps, suffix_from, suffix_to):
+    for model_name, field_names in HASH_FIELDS.items():
+        Model = apps.get_model('blockchain', model_name)
+        sources = [name + suffix_from for name in field_names]
+        targets = [name + suffix_to for name in field_names]
+        
+        batch = []
+        for obj in Model.objects.only('id', *sources).iterator(chunk_size=1000):
+            for source, target in zip(sources, targets):
+                setattr(obj, target, getattr(obj, source))
+            batch.append(obj)
+            
+            if len(batch) >= 1000:
+                Model.objects.bulk_update(batch, targets)
+                batch = []
+        
+        if batch:
+            Model.objects.bulk_update(batch, targets)
+
+
+def copy_hashes(apps, schema_editor):
+    _copy_hashes(apps, '', '_bin')
+
+
+def restore_hashes(apps, schema_editor):
+    _copy_hashes(apps, '_bin', '')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0004_blockchaintransaction_status_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blockchaintransaction',
+            name='event_hash_bin',
+            field=blockchain.utils.HashField(null=True),
+        ),
+        migrations.AddField(
+            model_name='blockchaintransaction',
+            name='tx_hash_bin',
+            field=blockchain.utils.HashField(null=True),
+        ),
+        migrations.AddField(
+            model_name='evidencehash',
+            name='file_hash_bin',
+            field=blockchain.utils.HashField(null=True, prefixed=False),
+        ),
+        migrations.AddField(
+            model_name='evidencehash',
+            name='tx_hash_bin',
+            field=blockchain.utils.HashField(null=True),
+        ),
+        migrations.AddField(
+            model_name='slatracker',
+            name='escalation_tx_hash_bin',
+            field=blockchain.utils.HashField(null=True),
+        ),
+        migrations.RunPython(copy_hashes, restore_hashes),
+        migrations.RemoveField(
+            model_name='blockchaintransaction',
+            name='event_hash',
+        ),
+        migrations.RenameField(
+            model_name='blockchaintransaction',
+            old_name='event_hash_bin',
+            new_name='event_hash',
+        ),
+        migrations.AlterField(
+            model_name='blockchaintransaction',
+            name='event_hash',
+            field=blockchain.utils.HashField(help_text='Keccak256 hash of event payload'),
+        ),
+        migrations.RemoveField(
+            model_name='blockchaintransaction',
+            name='tx_hash',
+        ),
+        migrations.RenameField(
+            model_name='blockchaintransaction',
+            old_name='tx_hash_bin',
+            new_name='tx_hash',
+        ),
+        migrations.AlterField(
+            model_name='blockchaintransaction',
+            name='tx_hash',
+            field=blockchain.utils.HashField(help_text='Ethereum transaction hash', unique=True),
+        ),
+        migrations.RemoveField(
+            model_name='evidencehash',
+            name='file_hash',
+        ),
+        migrations.RenameField(
+            model_name='evidencehash',
+            old_name='file_hash_bin',
+            new_name='file_hash',
+        ),
+        migrations.AlterField(
+            model_name='evidencehash',
+            name='file_hash',
+            field=blockchain.utils.HashField(help_text='SHA-256 hash of file content', prefixed=False),
+        ),
+        migrations.RemoveField(
+            model_name='evidencehash',
+            name='tx_hash',
+        ),
+        migrations.RenameField(
+            model_name='evidencehash',
+            old_name='tx_hash_bin',
+            new_name='tx_hash',
+        ),
+        migrations.AlterField(
+            model_name='evidencehash',
+            name='tx_hash',
+            field=blockchain.utils.HashField(help_text='Blockchain transaction hash'),
+        ),
+        migrations.RemoveField(
+            model_name='slatracker',
+            name='escalation_tx_hash',
+        ),
+        migrations.RenameField(
+            model_name='slatracker',
+            old_name='escalation_tx_hash_bin',
+            new_name='escalation_tx_hash',
+        ),
+        migrations.AlterField(
+            model_name='slatracker',
+            name='escalation_tx_hash',
+            field=blockchain.utils.HashField(blank=True),
+        ),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0005_store_hashes_as_bytes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blockchaintransaction',
+            index=models.Index(fields=['complaint_id', 'event_hash'], name='blockchain__complai_6ca3a9_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0006_blockchaintransaction_event_hash_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='blockchaintransaction',
+            name='complaint_id',
+            field=models.CharField(max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='blockchaintransaction',
+            name='event_type',
+            field=models.CharField(choices=[('CREATED', 'Complaint Created'), ('ASSIGNED', 'Complaint Assigned'), ('STATUS_UPDATED', 'Status Updated'), ('ESCALATED', 'Complaint Escalated'), ('RESOLVED', 'Complaint Resolved'), ('EVIDENCE_ADDED', 'Evidence Added')], max_length=20),
+        ),
+    ]
@@ -0,0 +1,26 @@
+import blockchain.utils
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0007_drop_redundant_blockchaintransaction_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blockchaintransaction',
+            name='event_index',
+            field=models.PositiveIntegerField(default=0, help_text='Position of this event among the ComplaintEvents of its transaction'),
+        ),
+        migrations.AddConstraint(
+            model_name='blockchaintransaction',
+            constraint=models.UniqueConstraint(fields=('tx_hash', 'event_index'), name='unique_tx_event'),
+        ),
+        migrations.AlterField(
+            model_name='blockchaintransaction',
+            name='tx_hash',
+            field=blockchain.utils.HashField(help_text='Ethereum transaction hash'),
+        ),
+    ]
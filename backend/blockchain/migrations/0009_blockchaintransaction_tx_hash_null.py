@@ -0,0 +1,30 @@
+import blockchain.utils
+from django.db import migrations
+
+
+def empty_to_null(apps, schema_editor):
+    # Unsent rows were stored with an empty hash; NULLs don't collide in
+    # unique_tx_event, so every failed event keeps its own row
+    BlockchainTransaction = apps.get_model('blockchain', 'BlockchainTransaction')
+    BlockchainTransaction.objects.filter(tx_hash='').update(tx_hash=None)
+
+
+def null_to_empty(apps, schema_editor):
+    BlockchainTransaction = apps.get_model('blockchain', 'BlockchainTransaction')
+    BlockchainTransaction.objects.filter(tx_hash__isnull=True).update(tx_hash='')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0008_blockchaintransaction_event_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='blockchaintransaction',
+            name='tx_hash',
+            field=blockchain.utils.HashField(blank=True, help_text='Ethereum transaction hash', null=True),
+        ),
+        migrations.RunPython(empty_to_null, null_to_empty),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from django.utils import timezone
 
+from .utils import CompressedJSONField, HashField
+
 
 class BlockchainTransaction(models.Model):
     EVENT_TYPES = [
@@ -18,34 +20,52 @@ class BlockchainTransaction(models.Model):
         ('FAILED', 'Failed'),
     ]
     
-    complaint_id = models.CharField(max_length=100, db_index=True)
-    event_type = models.CharField(max_length=20, choices=EVENT_TYPES, db_index=True)
-    event_hash = models.CharField(max_length=66, help_text="Keccak256 hash of event payload")
-    tx_hash = models.CharField(max_length=66, unique=True, help_text="Ethereum transaction hash")
+    # Indexed through the composite indexes in Meta (leading column)
+    complaint_id = models.CharField(max_length=100)
+    event_type = models.CharField(max_length=20, choices=EVENT_TYPES)
+    event_hash = HashField(help_text="Keccak256 hash of event payload")
+    # NULL until sent; unsent (FAILED) rows then never collide in unique_tx_event
+    tx_hash = HashField(null=True, blank=True, help_text="Ethereum transaction hash")
+    event_index = models.PositiveIntegerField(
+        default=0,
+        help_text="Position of this event among the ComplaintEvents of its transaction"
+    )
     block_number = models.BigIntegerField(null=True, blank=True)
     gas_used = models.BigIntegerField(null=True, blank=True)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
     timestamp = models.DateTimeField(default=timezone.now, db_index=True)
     
     # Store the full event payload for verification
-    event_payload = models.JSONField(help_text="Original event data that was hashed")
+    event_payload = CompressedJSONField(
+        help_text="Original event data that was hashed"
+    )
     
     class Meta:
         ordering = ['-timestamp']
+        constraints = [
+            # Batched events share a transaction
+            models.UniqueConstraint(fields=['tx_hash', 'event_index'], name='unique_tx_event'),
+        ]
         indexes = [
             models.Index(fields=['complaint_id', '-timestamp']),
             models.Index(fields=['event_type', '-timestamp']),
+            # Duplicate check before sending an event
+            models.Index(fields=['complaint_id', 'event_hash']),
+            # PENDING poller and FAILED retry queue, both ordered by time
+            models.Index(fields=['status', 'timestamp']),
+            # Last CONFIRMED block, where event sync resumes from
+            models.Index(fields=['status', '-block_number']),
         ]
     
     def __str__(self):
-        return f"{self.complaint_id} - {self.event_type} - {self.tx_hash[:10]}..."
+        return f"{self.complaint_id} - {self.event_type} - {(self.tx_hash or 'unsent')[:10]}..."
 
 
 class EvidenceHash(models.Model):
     complaint_id = models.CharField(max_length=100, db_index=True)
-    file_hash = models.CharField(max_length=64, help_text="SHA-256 hash of file content")
+    file_hash = HashField(prefixed=False, help_text="SHA-256 hash of file content")
     file_path = models.CharField(max_length=500, help_text="Local file path (relative to MEDIA_ROOT)")
-    tx_hash = models.CharField(max_length=66, help_text="Blockchain transaction hash")
+    tx_hash = HashField(help_text="Blockchain transaction hash")
     block_timestamp = models.BigIntegerField(help_text="Block timestamp from blockchain")
     verified = models.BooleanField(default=False, help_text="Has integrity been verified?")
     created_at = models.DateTimeField(auto_now_add=True)
@@ -79,7 +99,7 @@ class SLATracker(models.Model):
     complaint_id = models.CharField(max_length=100, unique=True, db_index=True)
     sla_deadline = models.BigIntegerField(help_text="Unix timestamp of SLA deadline")
     escalated = models.BooleanField(default=False, db_index=True)
-    escalation_tx_hash = models.CharField(max_length=66, blank=True)
+    escalation_tx_hash = HashField(blank=True)
     escalation_timestamp = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
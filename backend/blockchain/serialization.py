@@ -0,0 +1,38 @@
+"""
+orjson message serializer for Celery.
+
+Task messages carry whole event payloads (retries, evidence metadata).
+kombu's default 'json' serializer runs them through the stdlib encoder on
+publish and the decoder in the worker; this registers an 'orjson'
+serializer that does both in Rust and emits compact bytes.
+
+Imported by report_hub.celery (worker/beat) and blockchain.broker (web),
+so every process that publishes or consumes has it registered.
+"""
+
+from decimal import Decimal
+
+import orjson
+from kombu.serialization import register
+
+ORJSON_CONTENT_TYPE = 'application/x-orjson'
+
+
+def _default(obj):
+    # kombu's json serializer sends Decimals as strings; keep that behaviour
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def orjson_dumps(obj) -> bytes:
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+register(
+    'orjson',
+    orjson_dumps,
+    orjson.loads,
+    content_type=ORJSON_CONTENT_TYPE,
+    content_encoding='binary'
+)
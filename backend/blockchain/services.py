@@ -1,26 +1,294 @@
 import json
 import hashlib
 import logging
-from typing import Dict, List, Optional, Tuple
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
 
+import requests
 from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
 from django.utils import timezone
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from web3 import Web3
 from web3.middleware import geth_poa_middleware
+from eth_abi import decode as decode_abi, encode as encode_abi
 from eth_account import Account
+from eth_hash.auto import keccak
+from eth_utils import event_abi_to_log_topic, function_abi_to_4byte_selector
 
 from .models import BlockchainTransaction, EvidenceHash, SLATracker
+from .utils import canonical_payload_bytes, sha256_file, sha256_stream
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def load_contract_abi(abi_path: str) -> list:
+    """Read and parse the contract ABI once per process"""
+    with open(abi_path, 'r') as f:
+        return json.load(f)
+
+
+# Seconds a send may hold an account's nonce lock, and how long the shared
+# nonce counter survives without sends before it is re-read from the node
+NONCE_LOCK_TIMEOUT = 30
+NONCE_COUNTER_TTL = 3600
+
+# Serializes sends within this process when the shared counter isn't used
+_local_nonce_lock = threading.Lock()
+
+
+def _uses_shared_nonce() -> bool:
+    """
+    Whether sends coordinate nonces through Redis.
+    
+    Only multi-process Celery deployments need it; DEBUG/EAGER mode sends
+    synchronously from one process and runs without Redis.
+    """
+    if getattr(settings, 'DEBUG', False) or getattr(settings, 'CELERY_TASK_ALWAYS_EAGER', False):
+        return False
+    
+    return bool(getattr(settings, 'BLOCKCHAIN_EVENT_QUEUE_URL', None))
+
+
+# ============ Batched JSON-RPC ============
+
+# Concurrent requests when a node can't take batches (see rpc_each)
+RPC_FALLBACK_WORKERS = 16
+
+# Set once the node has rejected a batch; later calls skip straight to rpc_each
+_rpc_batch_unsupported = False
+
+
+class RPCBatchNotSupported(Exception):
+    """The node answered a JSON-RPC batch with a single (error) object"""
+
+
+# Keep-alive HTTP session shared by web3 and batched JSON-RPC calls
+_rpc_session = None
+_rpc_session_lock = threading.Lock()
+
+
+def get_rpc_session() -> requests.Session:
+    """
+    Get the shared, pooled HTTP session for the blockchain node.
+    
+    The default requests pool keeps 10 connections; threads beyond that
+    wait on each other, so size it for the number of concurrent callers.
+    """
+    global _rpc_session
+    
+    if _rpc_session is None:
+        with _rpc_session_lock:
+            if _rpc_session is None:
+                pool_size = settings.BLOCKCHAIN_HTTP_POOL_SIZE
+                adapter = HTTPAdapter(
+                    pool_connections=pool_size,
+                    pool_maxsize=pool_size,
+                    # Only retry failed connects: a re-sent POST could repeat a write
+                    max_retries=Retry(connect=3, read=0, backoff_factor=0.1)
+                )
+                session = requests.Session()
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _rpc_session = session
+    
+    return _rpc_session
+
+
+def rpc_batch(calls: List[Tuple[str, list]]) -> List:
+    """
+    Send several JSON-RPC calls to the node in as few HTTP requests as possible.
+    
+    web3 6.x has no batch_requests(), so the batch body is posted directly.
+    Results are raw JSON-RPC values (hex strings, None for unknown objects).
+    
+    Args:
+        calls: (method, params) pairs
+        
+    Returns:
+        One result per call, in order
+    """
+    global _rpc_batch_unsupported
+    
+    if _rpc_batch_unsupported:
+        return rpc_each(calls)
+    
+    try:
+        return _post_batches(calls)
+    except RPCBatchNotSupported:
+        logger.warning("Blockchain node rejected a JSON-RPC batch, sending calls individually")
+        _rpc_batch_unsupported = True
+        return rpc_each(calls)
+
+
+def _post_batches(calls: List[Tuple[str, list]]) -> List:
+    batch_size = settings.BLOCKCHAIN_RPC_BATCH_SIZE
+    chunks = [calls[start:start + batch_size] for start in range(0, len(calls), batch_size)]
+    
+    # Several chunks go out concurrently on the async client
+    if len(chunks) > 1:
+        from .async_service import async_available, rpc_batch_async, run_async
+        
+        if async_available():
+            return run_async(rpc_batch_async(chunks))
+    
+    results = []
+    for chunk in chunks:
+        response = get_rpc_session().post(
+            settings.BLOCKCHAIN_NODE_URL,
+            json=rpc_batch_body(chunk),
+            timeout=60
+        )
+        response.raise_for_status()
+        results.extend(rpc_batch_results(chunk, response.json()))
+    
+    return results
+
+
+def rpc_each(calls: List[Tuple[str, list]]) -> List:
+    """
+    Fallback for nodes without batch support: one request per call, sent
+    concurrently so the wait is about one round trip rather than one per call.
+    """
+    from .async_service import async_available, rpc_each_async, run_async
+    
+    if async_available():
+        return run_async(rpc_each_async(calls))
+    
+    with ThreadPoolExecutor(max_workers=min(RPC_FALLBACK_WORKERS, len(calls) or 1)) as executor:
+        return list(executor.map(_rpc_single, calls))
+
+
+def _rpc_single(call: Tuple[str, list]):
+    response = get_rpc_session().post(
+        settings.BLOCKCHAIN_NODE_URL,
+        json=rpc_batch_body([call])[0],
+        timeout=60
+    )
+    response.raise_for_status()
+    return rpc_batch_results([call], [response.json()])[0]
+
+
+def rpc_batch_body(chunk: List[Tuple[str, list]]) -> List[Dict]:
+    """JSON-RPC batch request body for (method, params) pairs"""
+    return [
+        {'jsonrpc': '2.0', 'id': i, 'method': method, 'params': params}
+        for i, (method, params) in enumerate(chunk)
+    ]
+
+
+def rpc_batch_results(chunk: List[Tuple[str, list]], response_items: List[Dict]) -> List:
+    """Match a batch response back to its calls (replies may be reordered)"""
+    # Nodes without batch support answer a batch with a single error object
+    # (id null); a lone call's own reply echoes its id
+    if isinstance(response_items, dict):
+        if len(chunk) > 1 or response_items.get('id') != 0:
+            raise RPCBatchNotSupported(response_items.get('error'))
+        response_items = [response_items]
+    
+    by_id = {item['id']: item for item in response_items}
+    
+    results = []
+    for i, (method, _) in enumerate(chunk):
+        item = by_id[i]
+        if 'error' in item:
+            raise ValueError(f"{method} failed: {item['error']}")
+        results.append(item.get('result'))
+    
+    return results
+
+
+@lru_cache(maxsize=4096)
+def get_block_timestamp(block_number: int) -> int:
+    """Block timestamp, cached since mined blocks don't change"""
+    block = rpc_batch([('eth_getBlockByNumber', [hex(block_number), False])])[0]
+    return int(block['timestamp'], 16)
+
+
+# Pending rows loaded (and receipts requested) per round in the poller
+PENDING_POLL_CHUNK_SIZE = 1000
+
+
+@lru_cache(maxsize=4096)
+def canonical_payload_digest(canonical: bytes) -> bytes:
+    """
+    keccak of canonical payload bytes, memoized by content.
+    
+    Retries and requeued batches re-hash payloads that were already hashed
+    (and looked up for de-duplication) on an earlier attempt.
+    """
+    return keccak(canonical)
+
+
+# verify_event cache keys of events known to be on-chain. A logged event
+# can't disappear, so a hit here skips even the shared cache round trip.
+VERIFIED_EVENTS_MAX = 65536
+_verified_events: Dict[str, None] = {}
+_verified_events_lock = threading.Lock()
+
+
+def _remember_verified(cache_keys) -> None:
+    """Record verified events, dropping the oldest past VERIFIED_EVENTS_MAX"""
+    with _verified_events_lock:
+        for key in cache_keys:
+            _verified_events[key] = None
+        while len(_verified_events) > VERIFIED_EVENTS_MAX:
+            del _verified_events[next(iter(_verified_events))]
+
+
+# (base gas price in wei, time.monotonic() when fetched), shared by all
+# BlockchainService instances in the process
+_gas_price_cache = (0, float('-inf'))
+_gas_price_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def contract_function_specs(abi_path: str) -> Dict[str, Tuple[bytes, Tuple[str, ...], Tuple[str, ...]]]:
+    """
+    Map each contract function to its 4-byte selector, input and output types.
+    
+    Lets calls be encoded and decoded with eth_abi directly instead of going
+    through ContractFunction every time.
+    """
+    specs = {}
+    for fn_abi in load_contract_abi(abi_path):
+        if fn_abi.get('type') != 'function':
+            continue
+        input_types = tuple(inp['type'] for inp in fn_abi.get('inputs', []))
+        output_types = tuple(out['type'] for out in fn_abi.get('outputs', []))
+        if any(t.startswith('tuple') for t in input_types + output_types):
+            continue
+        specs[fn_abi['name']] = (
+            function_abi_to_4byte_selector(fn_abi),
+            input_types,
+            output_types
+        )
+    
+    return specs
+
+
 class BlockchainService:
     def __init__(self):
         """Initialize Web3 connection and contract instance"""
         self.w3 = self._connect_to_blockchain()
         self.contract = self._load_contract()
+        self._functions = contract_function_specs(settings.BLOCKCHAIN_CONTRACT_ABI_PATH)
+        self._escalated_event = self.contract.events.ComplaintEscalated()
+        self._escalated_topic = event_abi_to_log_topic(self._escalated_event.abi)
         self.account = self._load_account()
+        self.chain_id = self.w3.eth.chain_id
+        logger.info(f"Connected to blockchain (Chain ID: {self.chain_id})")
+        
+        self._nonce_key = f"bc:nonce:{self.account.address}"
     
     def _connect_to_blockchain(self) -> Web3:
         """Establish connection to Amazon Managed Blockchain"""
@@ -28,7 +296,8 @@ class BlockchainService:
             node_url = settings.BLOCKCHAIN_NODE_URL
             w3 = Web3(Web3.HTTPProvider(
                 node_url,
-                request_kwargs={'timeout': 60}
+                request_kwargs={'timeout': 60},
+                session=get_rpc_session()
             ))
             
             # Add middleware for PoA chains if needed
@@ -38,7 +307,6 @@ class BlockchainService:
             if not w3.is_connected():
                 raise ConnectionError("Cannot connect to blockchain node")
             
-            logger.info(f"Connected to blockchain (Chain ID: {w3.eth.chain_id})")
             return w3
             
         except Exception as e:
@@ -48,10 +316,8 @@ class BlockchainService:
     def _load_contract(self):
         """Load contract ABI and create contract instance"""
         try:
-            # Load ABI from file
-            abi_path = settings.BLOCKCHAIN_CONTRACT_ABI_PATH
-            with open(abi_path, 'r') as f:
-                contract_abi = json.load(f)
+            # Load ABI from file (cached after the first service instance)
+            contract_abi = load_contract_abi(settings.BLOCKCHAIN_CONTRACT_ABI_PATH)
             
             # Create contract instance
             contract_address = settings.BLOCKCHAIN_CONTRACT_ADDRESS
@@ -79,23 +345,133 @@ class BlockchainService:
             logger.error(f"Failed to load account: {e}")
             raise
     
-    def _build_and_send_transaction(self, function_call, event_type: str) -> Tuple[str, Dict]:
+    def _sign_and_send(self, tx: Dict):
+        """
+        Assign the next nonce, sign and send, holding the account's nonce lock.
+        
+        Every process sending from this account (default and bc_eventlet
+        workers) shares one counter in Redis, under a Redis lock, so they
+        can't hand out the same nonce. The counter only advances once the
+        node has accepted the transaction; any failure drops it so the next
+        send re-seeds from the node's pending count instead of leaving a gap.
+        
+        In DEBUG/EAGER mode, or if Redis can't be reached, sends take the
+        node's pending count under a process-local lock instead.
+        """
+        if not _uses_shared_nonce():
+            return self._sign_and_send_local(tx)
+        
+        import redis
+        from .event_queue import get_redis_client
+        
+        client = get_redis_client()
+        lock = client.lock(
+            f"{self._nonce_key}:lock",
+            timeout=NONCE_LOCK_TIMEOUT,
+            blocking_timeout=NONCE_LOCK_TIMEOUT
+        )
         try:
-            # Build transaction
-            tx = function_call.build_transaction({
-                'from': self.account.address,
-                'nonce': self.w3.eth.get_transaction_count(self.account.address),
+            acquired = lock.acquire()
+        except redis.ConnectionError as e:
+            logger.warning(f"Nonce lock unavailable ({e}), using the node's pending count")
+            return self._sign_and_send_local(tx)
+        
+        if not acquired:
+            raise redis.exceptions.LockError("Could not acquire the nonce lock")
+        
+        try:
+            stored = client.get(self._nonce_key)
+            if stored is not None:
+                nonce = int(stored)
+            else:
+                nonce = self.w3.eth.get_transaction_count(self.account.address, 'pending')
+            
+            try:
+                tx_hash = self._send_with_nonce(tx, nonce)
+            except Exception:
+                # Counter may be out of step (nonce too low, replaced tx, ...)
+                client.delete(self._nonce_key)
+                raise
+            
+            try:
+                client.set(self._nonce_key, nonce + 1, ex=NONCE_COUNTER_TTL)
+            except redis.RedisError as e:
+                # Already sent; the next send re-seeds from the node
+                logger.warning(f"Could not store next nonce: {e}")
+        finally:
+            try:
+                lock.release()
+            except redis.RedisError as e:
+                # Expired or unreachable; it times out on its own
+                logger.warning(f"Could not release nonce lock: {e}")
+        
+        return tx_hash
+    
+    def _sign_and_send_local(self, tx: Dict):
+        """Sign and send with the node's pending nonce, serialized in-process"""
+        with _local_nonce_lock:
+            nonce = self.w3.eth.get_transaction_count(self.account.address, 'pending')
+            return self._send_with_nonce(tx, nonce)
+    
+    def _send_with_nonce(self, tx: Dict, nonce: int):
+        signed_tx = self.account.sign_transaction({**tx, 'nonce': nonce})
+        return self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+    
+    def _encode_call(self, fn_name: str, *args) -> str:
+        """ABI-encode a contract call using the cached selector and input types"""
+        selector, input_types, _ = self._functions[fn_name]
+        return '0x' + (selector + encode_abi(input_types, args)).hex()
+    
+    def _batch_call(self, fn_name: str, args_list: List[tuple]) -> List[tuple]:
+        """
+        Run the same view function for many argument tuples.
+        
+        All eth_calls go out as batched JSON-RPC requests instead of one
+        round trip each.
+        
+        Returns:
+            Decoded outputs, one tuple per argument tuple
+        """
+        output_types = self._functions[fn_name][2]
+        target = self.contract.address
+        
+        results = rpc_batch([
+            ('eth_call', [{'to': target, 'data': self._encode_call(fn_name, *args)}, 'latest'])
+            for args in args_list
+        ])
+        return [decode_abi(output_types, bytes.fromhex(result[2:])) for result in results]
+    
+    def _build_and_send_transaction(
+        self,
+        call_data: str,
+        event_type: str,
+        wait_for_receipt: bool = True
+    ) -> Tuple[str, Optional[Dict]]:
+        """
+        Sign and send a contract call (calldata from _encode_call).
+        
+        With wait_for_receipt=False the hash is returned as soon as the node
+        accepts the transaction and the receipt is None; the row is settled
+        later by poll_pending_transactions.
+        """
+        try:
+            # Build transaction directly; every field is known locally
+            tx = {
+                'to': self.contract.address,
+                'data': call_data,
+                'value': 0,
+                'chainId': self.chain_id,
                 'gas': settings.BLOCKCHAIN_GAS_LIMIT,
                 'gasPrice': self._get_gas_price(),
-            })
-            
-            # Sign transaction
-            signed_tx = self.account.sign_transaction(tx)
+            }
             
-            # Send transaction
-            tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            # The nonce is taken last, right before signing and sending
+            tx_hash = self._sign_and_send(tx)
             logger.info(f"{event_type} - Transaction sent: {tx_hash.hex()}")
             
+            if not wait_for_receipt:
+                return tx_hash.hex(), None
+            
             # Wait for receipt
             tx_receipt = self.w3.eth.wait_for_transaction_receipt(
                 tx_hash,
@@ -115,60 +491,91 @@ class BlockchainService:
             raise
     
     def _get_gas_price(self) -> int:
-        """Get current gas price with optional multiplier"""
-        base_price = self.w3.eth.gas_price
+        """Get current gas price with optional multiplier (cached for a few seconds)"""
+        global _gas_price_cache
+        
+        with _gas_price_lock:
+            base_price, fetched_at = _gas_price_cache
+            now = time.monotonic()
+            if now - fetched_at > settings.BLOCKCHAIN_GAS_PRICE_TTL:
+                base_price = self.w3.eth.gas_price
+                _gas_price_cache = (base_price, now)
+        
         multiplier = getattr(settings, 'BLOCKCHAIN_GAS_PRICE_MULTIPLIER', 1.1)
         return int(base_price * multiplier)
     
     @staticmethod
     def hash_event_payload(payload: Dict) -> str:
-        json_str = json.dumps(payload, sort_keys=True, separators=(',', ':'))
-        hash_bytes = Web3.keccak(text=json_str)
-        
-        return hash_bytes.hex()
+        return '0x' + BlockchainService.event_payload_digest(payload).hex()
+    
+    @staticmethod
+    def event_payload_digest(payload: Dict) -> bytes:
+        """Raw 32-byte keccak of the canonical payload, as the contract takes it"""
+        return canonical_payload_digest(canonical_payload_bytes(payload))
     
     @staticmethod
     def hash_file_content(file_content: bytes) -> str:
         return hashlib.sha256(file_content).hexdigest()
     
+    @staticmethod
+    def hash_file_stream(file_obj: Union[BinaryIO, str, Path]) -> str:
+        """SHA-256 of a file object or path, streamed (see utils.sha256_stream)"""
+        if isinstance(file_obj, (str, Path)):
+            return sha256_file(file_obj)
+        
+        return sha256_stream(file_obj)
+    
     def log_complaint_event(
         self,
         complaint_id: str,
         event_type: str,
         payload: Dict
     ) -> Optional[BlockchainTransaction]:
+        tx_hash = None
         try:
             # Hash the payload
-            event_hash = self.hash_event_payload(payload)
+            event_digest = self.event_payload_digest(payload)
+            event_hash = '0x' + event_digest.hex()
+            
+            # A retried call for an event that was already sent is a no-op
+            existing = find_logged_event(complaint_id, event_hash)
+            if existing:
+                logger.info(
+                    f"Complaint event already logged: {complaint_id} - {event_type} - {existing.tx_hash}"
+                )
+                return existing
             
             # Call smart contract
-            function_call = self.contract.functions.logComplaintEvent(
+            call_data = self._encode_call(
+                'logComplaintEvent',
                 complaint_id,
                 event_type,
-                Web3.to_bytes(hexstr=event_hash)
+                event_digest
             )
             
-            # Send transaction
-            tx_hash, tx_receipt = self._build_and_send_transaction(
-                function_call,
-                f"LOG_EVENT_{event_type}"
+            # Send transaction; the receipt is picked up by the pending poller
+            tx_hash, _ = self._build_and_send_transaction(
+                call_data,
+                f"LOG_EVENT_{event_type}",
+                wait_for_receipt=False
             )
             
-            # Store in database
-            blockchain_tx = BlockchainTransaction.objects.create(
+            cache.delete(f"blockchain:verify_event:{complaint_id}:{event_hash}")
+            
+            # Recorded right away: the transaction is already on its way
+            blockchain_tx = BlockchainTransaction(
                 complaint_id=complaint_id,
                 event_type=event_type,
                 event_hash=event_hash,
                 tx_hash=tx_hash,
-                block_number=tx_receipt['blockNumber'],
-                gas_used=tx_receipt['gasUsed'],
-                status='CONFIRMED',
+                status='PENDING',
                 event_payload=payload,
                 timestamp=timezone.now()
             )
+            store_transaction_rows([blockchain_tx])
             
             logger.info(
-                f"Complaint event logged: {complaint_id} - {event_type} - {tx_hash}"
+                f"Complaint event sent: {complaint_id} - {event_type} - {tx_hash}"
             )
             
             return blockchain_tx
@@ -176,18 +583,181 @@ class BlockchainService:
         except Exception as e:
             logger.error(f"Failed to log complaint event: {e}")
             
+            if tx_hash:
+                # Sent, but the row couldn't be written; retrying would log
+                # the event twice, and event sync will record the tx
+                logger.error(f"Complaint event {complaint_id} sent as {tx_hash} but not stored")
+                return None
+            
             # Store failed transaction for retry
-            BlockchainTransaction.objects.create(
+            try:
+                BlockchainTransaction.objects.create(
+                    complaint_id=complaint_id,
+                    event_type=event_type,
+                    event_hash=event_hash if 'event_hash' in locals() else '',
+                    tx_hash=None,
+                    status='FAILED',
+                    event_payload=payload,
+                    timestamp=timezone.now()
+                )
+            except Exception as store_error:
+                logger.error(f"Failed to store failed transaction {complaint_id}: {store_error}")
+            
+            return None
+    
+    def log_complaint_events_batch(self, events: List[Dict]) -> List[BlockchainTransaction]:
+        """
+        Log many complaint events with a single batchLogComplaintEvents transaction.
+        
+        Events that were already sent are skipped. Contracts deployed before
+        batchLogComplaintEvents existed get one transaction per event instead.
+        
+        Args:
+            events: Dicts with complaint_id, event_type and payload
+            
+        Returns:
+            One BlockchainTransaction per event (existing rows for duplicates)
+            
+        Raises:
+            Exception: If the batch transaction could not be sent. Once it
+                has been sent, failing to store its rows is only logged so
+                the events aren't sent again.
+        """
+        if 'batchLogComplaintEvents' not in self._functions:
+            rows = [
+                self.log_complaint_event(e['complaint_id'], e['event_type'], e['payload'])
+                for e in events
+            ]
+            return [row for row in rows if row]
+        
+        rows = []
+        to_send = {}
+        for event in events:
+            event_digest = self.event_payload_digest(event['payload'])
+            event_hash = '0x' + event_digest.hex()
+            key = (event['complaint_id'], event_hash)
+            
+            existing = find_logged_event(*key)
+            if existing:
+                rows.append(existing)
+            elif key not in to_send:
+                to_send[key] = (event, event_digest)
+        
+        if not to_send:
+            return rows
+        
+        batch = list(to_send.values())
+        call_data = self._encode_call(
+            'batchLogComplaintEvents',
+            [event['complaint_id'] for event, _ in batch],
+            [event['event_type'] for event, _ in batch],
+            [event_digest for _, event_digest in batch]
+        )
+        
+        # Send transaction; the receipt is picked up by the pending poller
+        tx_hash, _ = self._build_and_send_transaction(
+            call_data,
+            f"LOG_EVENT_BATCH_{len(batch)}",
+            wait_for_receipt=False
+        )
+        
+        cache.delete_many([
+            f"blockchain:verify_event:{complaint_id}:{event_hash}"
+            for complaint_id, event_hash in to_send
+        ])
+        
+        now = timezone.now()
+        sent_rows = [
+            BlockchainTransaction(
                 complaint_id=complaint_id,
-                event_type=event_type,
-                event_hash=event_hash if 'event_hash' in locals() else '',
-                tx_hash='',
-                status='FAILED',
-                event_payload=payload,
-                timestamp=timezone.now()
+                event_type=event['event_type'],
+                event_hash=event_hash,
+                tx_hash=tx_hash,
+                event_index=event_index,
+                status='PENDING',
+                event_payload=event['payload'],
+                timestamp=now
             )
+            for event_index, ((complaint_id, event_hash), (event, _)) in enumerate(to_send.items())
+        ]
+        try:
+            store_transaction_rows(sent_rows)
+        except Exception as e:
+            # The event listener records the mined events as they arrive
+            logger.error(f"Complaint event batch sent as {tx_hash} but not stored: {e}")
+            return rows
+        rows.extend(sent_rows)
+        
+        logger.info(f"Complaint event batch sent: {len(batch)} events - {tx_hash}")
+        
+        return rows
+    
+    def poll_pending_transactions(self, limit: int = 10000) -> Dict[str, int]:
+        """
+        Settle PENDING transactions whose receipts are now available.
+        
+        Pending rows (id and tx_hash only) are claimed in chunks with
+        SELECT ... FOR UPDATE SKIP LOCKED, so several workers can poll at
+        once without fetching the same receipts. Each chunk gets its receipts
+        with batched JSON-RPC and is written back with one bulk_update
+        before its locks are released. Transactions not mined yet are left
+        for the next run.
+        
+        Args:
+            limit: Maximum number of pending rows to look at
             
-            return None
+        Returns:
+            Counts of confirmed and failed rows
+        """
+        counts = {'confirmed': 0, 'failed': 0}
+        last_id = 0
+        seen = 0
+        
+        while seen < limit:
+            with transaction.atomic():
+                chunk = list(
+                    BlockchainTransaction.objects.select_for_update(skip_locked=True)
+                    .filter(status='PENDING', id__gt=last_id, tx_hash__isnull=False)
+                    .only('id', 'tx_hash')
+                    .order_by('id')[:min(PENDING_POLL_CHUNK_SIZE, limit - seen)]
+                )
+                if not chunk:
+                    break
+                
+                self._settle_pending_chunk(chunk, counts)
+            
+            last_id = chunk[-1].id
+            seen += len(chunk)
+        
+        return counts
+    
+    def _settle_pending_chunk(self, pending: List[BlockchainTransaction], counts: Dict[str, int]):
+        """Apply receipts to one chunk of pending rows and save the mined ones"""
+        # Events logged in one batch share a transaction and its receipt
+        tx_hashes = list({tx.tx_hash for tx in pending})
+        receipts = dict(zip(tx_hashes, rpc_batch([
+            ('eth_getTransactionReceipt', [tx_hash]) for tx_hash in tx_hashes
+        ])))
+        
+        settled = []
+        for tx in pending:
+            receipt = receipts[tx.tx_hash]
+            if receipt is None:
+                continue
+            
+            succeeded = int(receipt['status'], 16) == 1
+            tx.block_number = int(receipt['blockNumber'], 16)
+            tx.gas_used = int(receipt['gasUsed'], 16)
+            tx.status = 'CONFIRMED' if succeeded else 'FAILED'
+            counts['confirmed' if succeeded else 'failed'] += 1
+            settled.append(tx)
+        
+        if settled:
+            BlockchainTransaction.objects.bulk_update(
+                settled,
+                ['block_number', 'gas_used', 'status'],
+                batch_size=settings.BLOCKCHAIN_BULK_BATCH_SIZE
+            )
     
     def anchor_evidence(
         self,
@@ -198,20 +768,22 @@ class BlockchainService:
     ) -> Optional[EvidenceHash]:
         try:
             # Call smart contract
-            function_call = self.contract.functions.anchorEvidence(
+            call_data = self._encode_call(
+                'anchorEvidence',
                 complaint_id,
-                Web3.to_bytes(hexstr=file_hash)
+                bytes.fromhex(file_hash.removeprefix('0x'))
             )
             
             # Send transaction
             tx_hash, tx_receipt = self._build_and_send_transaction(
-                function_call,
+                call_data,
                 "ANCHOR_EVIDENCE"
             )
             
+            cache.delete(f"blockchain:evidence_anchor:{complaint_id}:{file_hash}")
+            
             # Get block timestamp
-            block = self.w3.eth.get_block(tx_receipt['blockNumber'])
-            block_timestamp = block['timestamp']
+            block_timestamp = get_block_timestamp(tx_receipt['blockNumber'])
             
             # Store in database
             evidence = EvidenceHash.objects.create(
@@ -262,14 +834,15 @@ class BlockchainService:
             deadline_timestamp = int(deadline_dt.timestamp())
             
             # Call smart contract
-            function_call = self.contract.functions.setSLADeadline(
+            call_data = self._encode_call(
+                'setSLADeadline',
                 complaint_id,
                 deadline_timestamp
             )
             
             # Send transaction
             tx_hash, tx_receipt = self._build_and_send_transaction(
-                function_call,
+                call_data,
                 "SET_SLA_DEADLINE"
             )
             
@@ -283,6 +856,7 @@ class BlockchainService:
                     'escalation_timestamp': None
                 }
             )
+            cache.delete(f"blockchain:sla_status:{complaint_id}")
             
             logger.info(
                 f"SLA deadline set: {complaint_id} - {deadline_dt} - {tx_hash}"
@@ -294,6 +868,19 @@ class BlockchainService:
             logger.error(f"Failed to set SLA deadline: {e}")
             return None
     
+    def _escalated_complaint_ids(self, tx_receipt) -> List[str]:
+        """
+        Complaint ids from the ComplaintEscalated logs in a receipt.
+        
+        Logs are matched on topic0 first, so only our own events are decoded.
+        """
+        return [
+            self._escalated_event.process_log(log)['args']['complaintId']
+            for log in tx_receipt['logs']
+            if log['topics'] and log['topics'][0] == self._escalated_topic
+            and log['address'] == self.contract.address
+        ]
+    
     def check_and_escalate(self, complaint_id: str) -> bool:
         """
         Check SLA and escalate if deadline breached.
@@ -309,35 +896,28 @@ class BlockchainService:
         """
         try:
             # Call smart contract
-            function_call = self.contract.functions.checkAndEscalate(complaint_id)
+            call_data = self._encode_call('checkAndEscalate', complaint_id)
             
             # Send transaction
             tx_hash, tx_receipt = self._build_and_send_transaction(
-                function_call,
+                call_data,
                 "CHECK_AND_ESCALATE"
             )
             
             # Check if escalation occurred by parsing events
-            escalated = False
-            for log in tx_receipt['logs']:
-                try:
-                    event = self.contract.events.ComplaintEscalated().process_log(log)
-                    if event['args']['complaintId'] == complaint_id:
-                        escalated = True
-                        
-                        # Update database
-                        SLATracker.objects.filter(
-                            complaint_id=complaint_id
-                        ).update(
-                            escalated=True,
-                            escalation_tx_hash=tx_hash,
-                            escalation_timestamp=timezone.now()
-                        )
-                        
-                        logger.warning(f"Complaint escalated: {complaint_id}")
-                        break
-                except:
-                    continue
+            escalated = complaint_id in self._escalated_complaint_ids(tx_receipt)
+            if escalated:
+                # Update database
+                SLATracker.objects.filter(
+                    complaint_id=complaint_id
+                ).update(
+                    escalated=True,
+                    escalation_tx_hash=tx_hash,
+                    escalation_timestamp=timezone.now()
+                )
+                cache.delete(f"blockchain:sla_status:{complaint_id}")
+                
+                logger.warning(f"Complaint escalated: {complaint_id}")
             
             return escalated
             
@@ -362,38 +942,34 @@ class BlockchainService:
                 return 0
             
             # Call smart contract
-            function_call = self.contract.functions.batchCheckAndEscalate(
+            call_data = self._encode_call(
+                'batchCheckAndEscalate',
                 complaint_ids
             )
             
             # Send transaction
             tx_hash, tx_receipt = self._build_and_send_transaction(
-                function_call,
+                call_data,
                 "BATCH_CHECK_ESCALATE"
             )
             
             # Parse escalation events
-            escalated_count = 0
-            for log in tx_receipt['logs']:
-                try:
-                    event = self.contract.events.ComplaintEscalated().process_log(log)
-                    complaint_id = event['args']['complaintId']
-                    
-                    # Update database
-                    SLATracker.objects.filter(
-                        complaint_id=complaint_id
-                    ).update(
-                        escalated=True,
-                        escalation_tx_hash=tx_hash,
-                        escalation_timestamp=timezone.now()
-                    )
-                    
-                    escalated_count += 1
-                    logger.warning(f"Complaint escalated: {complaint_id}")
-                    
-                except:
-                    continue
+            escalated_ids = self._escalated_complaint_ids(tx_receipt)
+            for complaint_id in escalated_ids:
+                logger.warning(f"Complaint escalated: {complaint_id}")
             
+            # Update database in a single statement
+            if escalated_ids:
+                SLATracker.objects.filter(
+                    complaint_id__in=escalated_ids
+                ).update(
+                    escalated=True,
+                    escalation_tx_hash=tx_hash,
+                    escalation_timestamp=timezone.now()
+                )
+                cache.delete_many([f"blockchain:sla_status:{cid}" for cid in escalated_ids])
+            
+            escalated_count = len(escalated_ids)
             logger.info(f"Batch escalation: {escalated_count} of {len(complaint_ids)}")
             return escalated_count
             
@@ -415,21 +991,85 @@ class BlockchainService:
             True if event exists on-chain
         """
         try:
-            exists = self.contract.functions.verifyEvent(
-                complaint_id,
-                Web3.to_bytes(hexstr=event_hash)
-            ).call()
+            cache_key = f"blockchain:verify_event:{complaint_id}:{event_hash}"
+            if cache_key in _verified_events:
+                return True
+            
+            exists = cache.get(cache_key)
+            if exists is None:
+                exists = self.contract.functions.verifyEvent(
+                    complaint_id,
+                    Web3.to_bytes(hexstr=event_hash)
+                ).call()
+                
+                # A logged event can't disappear, so only a miss needs to expire quickly
+                cache.set(
+                    cache_key,
+                    exists,
+                    None if exists else settings.BLOCKCHAIN_READ_CACHE_TTL
+                )
             
+            if exists:
+                _remember_verified([cache_key])
             return exists
             
         except Exception as e:
             logger.error(f"Event verification failed: {e}")
             return False
     
+    def verify_events_batch(self, complaint_id: str, event_hashes: List[str]) -> List[bool]:
+        """
+        Verify many events of one complaint with one round trip to the node.
+        
+        Args:
+            complaint_id: Complaint identifier
+            event_hashes: Event hashes to verify
+            
+        Returns:
+            One flag per hash, in order (all False if the lookup failed)
+        """
+        try:
+            keys = [f"blockchain:verify_event:{complaint_id}:{h}" for h in event_hashes]
+            cached = dict.fromkeys((key for key in keys if key in _verified_events), True)
+            
+            unknown = [key for key in keys if key not in cached]
+            if unknown:
+                cached.update(cache.get_many(unknown))
+            
+            missing = sorted({h for h, key in zip(event_hashes, keys) if key not in cached})
+            if missing:
+                fetched = dict(zip(missing, (
+                    exists for (exists,) in self._batch_call(
+                        'verifyEvent',
+                        [(complaint_id, Web3.to_bytes(hexstr=h)) for h in missing]
+                    )
+                )))
+                
+                fetched = {
+                    f"blockchain:verify_event:{complaint_id}:{h}": exists
+                    for h, exists in fetched.items()
+                }
+                cached.update(fetched)
+                
+                # Same expiry rules as verify_event: hits are kept for good
+                hits = {key: True for key, exists in fetched.items() if exists}
+                misses = {key: False for key, exists in fetched.items() if not exists}
+                if hits:
+                    cache.set_many(hits, None)
+                if misses:
+                    cache.set_many(misses, settings.BLOCKCHAIN_READ_CACHE_TTL)
+            
+            _remember_verified(key for key, exists in cached.items() if exists)
+            return [cached[key] for key in keys]
+            
+        except Exception as e:
+            logger.error(f"Batch event verification failed: {e}")
+            return [False] * len(event_hashes)
+    
     def verify_evidence_integrity(
         self,
         complaint_id: str,
-        file_content: bytes,
+        file_content: Union[bytes, BinaryIO],
     ) -> Tuple[bool, Optional[Dict]]:
         """
         Verify evidence file integrity against blockchain record.
@@ -441,41 +1081,51 @@ class BlockchainService:
         
         Args:
             complaint_id: Complaint identifier
-            file_content: Raw file bytes to verify
+            file_content: Raw file bytes or a file-like object to verify
             
         Returns:
             (verified, details_dict)
         """
         try:
             # Compute hash of provided content
-            computed_hash = self.hash_file_content(file_content)
+            if isinstance(file_content, (bytes, bytearray)):
+                computed_hash = self.hash_file_content(file_content)
+            else:
+                computed_hash = self.hash_file_stream(file_content)
             
-            # Query blockchain
-            block_timestamp = self.contract.functions.verifyEvidenceAnchor(
-                complaint_id,
-                Web3.to_bytes(hexstr=computed_hash)
-            ).call()
+            # Query blockchain (anchors are permanent, so hits are cached for good)
+            cache_key = f"blockchain:evidence_anchor:{complaint_id}:{computed_hash}"
+            block_timestamp = cache.get(cache_key)
+            if block_timestamp is None:
+                block_timestamp = self.contract.functions.verifyEvidenceAnchor(
+                    complaint_id,
+                    bytes.fromhex(computed_hash)
+                ).call()
+                cache.set(
+                    cache_key,
+                    block_timestamp,
+                    None if block_timestamp else settings.BLOCKCHAIN_READ_CACHE_TTL
+                )
             
             if block_timestamp == 0:
                 return False, {'error': 'Hash not found on blockchain'}
             
-            # Get local record
-            evidence = EvidenceHash.objects.filter(
+            # Get local record, then mark it verified without reloading it
+            records = EvidenceHash.objects.filter(
                 complaint_id=complaint_id,
                 file_hash=computed_hash
-            ).first()
+            )
+            evidence = records.values('file_path').first()
             
             if evidence:
-                # Mark as verified
-                evidence.verified = True
-                evidence.save()
+                records.update(verified=True)
             
             details = {
                 'verified': True,
                 'file_hash': computed_hash,
                 'block_timestamp': block_timestamp,
                 'anchored_at': datetime.fromtimestamp(block_timestamp),
-                'file_path': evidence.file_path if evidence else None
+                'file_path': evidence['file_path'] if evidence else None
             }
             
             return True, details
@@ -495,25 +1145,122 @@ class BlockchainService:
             Dictionary with deadline, escalated status, time_remaining
         """
         try:
-            deadline, escalated, time_remaining = self.contract.functions.getSLAStatus(
-                complaint_id
-            ).call()
+            cache_key = f"blockchain:sla_status:{complaint_id}"
+            status = cache.get(cache_key)
+            if status is None:
+                status = self.contract.functions.getSLAStatus(complaint_id).call()
+                cache.set(cache_key, status, settings.BLOCKCHAIN_READ_CACHE_TTL)
             
-            return {
-                'deadline': deadline,
-                'deadline_datetime': datetime.fromtimestamp(deadline) if deadline > 0 else None,
-                'escalated': escalated,
-                'time_remaining_seconds': time_remaining,
-                'should_escalate': time_remaining == 0 and not escalated
-            }
+            return self._format_sla_status(status)
             
         except Exception as e:
             logger.error(f"Failed to get SLA status: {e}")
             return None
+    
+    def batch_get_sla_status(self, complaint_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Get SLA status for many complaints with one round trip to the node.
+        
+        Args:
+            complaint_ids: Complaint identifiers
+            
+        Returns:
+            Mapping of complaint_id to the get_sla_status dictionary
+            (empty if the lookup failed)
+        """
+        try:
+            keys = {cid: f"blockchain:sla_status:{cid}" for cid in complaint_ids}
+            cached = cache.get_many(keys.values())
+            statuses = {
+                cid: cached[key] for cid, key in keys.items() if key in cached
+            }
+            
+            missing = [cid for cid in keys if cid not in statuses]
+            if missing:
+                fetched = dict(zip(
+                    missing,
+                    self._batch_call('getSLAStatus', [(cid,) for cid in missing])
+                ))
+                cache.set_many(
+                    {keys[cid]: status for cid, status in fetched.items()},
+                    settings.BLOCKCHAIN_READ_CACHE_TTL
+                )
+                statuses.update(fetched)
+            
+            return {
+                cid: self._format_sla_status(status)
+                for cid, status in statuses.items()
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to get SLA statuses: {e}")
+            return {}
+    
+    @staticmethod
+    def _format_sla_status(status: tuple) -> Dict:
+        deadline, escalated, time_remaining = status
+        
+        return {
+            'deadline': deadline,
+            'deadline_datetime': datetime.fromtimestamp(deadline) if deadline > 0 else None,
+            'escalated': escalated,
+            'time_remaining_seconds': time_remaining,
+            'should_escalate': time_remaining == 0 and not escalated
+        }
+
+
+# ============ Transaction Rows ============
+
+def store_transaction_rows(rows: List[BlockchainTransaction]) -> None:
+    """
+    Insert the rows for a transaction that has just been sent.
+    
+    Written synchronously: once the transaction is on its way, the row is
+    what poll_pending_transactions settles and find_logged_event dedupes
+    against. Batches use one multi-row INSERT. If the event listener
+    already stored a (tx_hash, event_index) row from the mined log, that
+    row is kept and given the payload it doesn't know.
+    """
+    try:
+        with transaction.atomic():
+            if len(rows) == 1:
+                rows[0].save()
+            else:
+                BlockchainTransaction.objects.bulk_create(
+                    rows,
+                    batch_size=settings.BLOCKCHAIN_BULK_BATCH_SIZE
+                )
+        return
+    except IntegrityError:
+        pass
+    
+    for row in rows:
+        try:
+            with transaction.atomic():
+                row.save()
+        except IntegrityError:
+            BlockchainTransaction.objects.filter(
+                tx_hash=row.tx_hash,
+                event_index=row.event_index
+            ).update(event_payload=row.event_payload)
+            row.pk = BlockchainTransaction.objects.filter(
+                tx_hash=row.tx_hash,
+                event_index=row.event_index
+            ).values_list('pk', flat=True).first()
+
+
+def find_logged_event(complaint_id: str, event_hash: str) -> Optional[BlockchainTransaction]:
+    """Find a sent (PENDING or CONFIRMED) transaction for this exact event"""
+    return BlockchainTransaction.objects.filter(
+        complaint_id=complaint_id,
+        event_hash=event_hash,
+        status__in=['PENDING', 'CONFIRMED']
+    ).only('id', 'tx_hash', 'block_number', 'gas_used', 'status').first()
 
 
 # Singleton instance
 _blockchain_service = None
+_blockchain_service_lock = threading.Lock()
 
 
 def get_blockchain_service() -> BlockchainService:
@@ -521,6 +1268,32 @@ def get_blockchain_service() -> BlockchainService:
     global _blockchain_service
     
     if _blockchain_service is None:
-        _blockchain_service = BlockchainService()
+        with _blockchain_service_lock:
+            if _blockchain_service is None:
+                _blockchain_service = BlockchainService()
     
     return _blockchain_service
+
+
+def _reset_after_fork():
+    """
+    Drop per-process connection state in a forked child (prefork workers).
+    
+    Pooled keep-alive sockets inherited from the parent would be shared by
+    both processes.
+    """
+    global _rpc_session, _rpc_session_lock, _blockchain_service, _blockchain_service_lock
+    global _gas_price_lock, _verified_events_lock, _local_nonce_lock
+    
+    _rpc_session = None
+    _blockchain_service = None
+    
+    # A lock held by another parent thread at fork time is never released here
+    _rpc_session_lock = threading.Lock()
+    _blockchain_service_lock = threading.Lock()
+    _gas_price_lock = threading.Lock()
+    _verified_events_lock = threading.Lock()
+    _local_nonce_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -13,6 +13,9 @@ to avoid blocking HTTP responses.
 """
 
 import logging
+from functools import partial
+
+from django.db import transaction
 from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 from django.conf import settings
@@ -38,7 +41,6 @@ def log_complaint_created(sender, instance, created, **kwargs):
     
     try:
         from blockchain.utils import create_event_payload
-        from blockchain.tasks import log_complaint_event_async
         
         # Create event payload with actual model fields
         payload = create_event_payload(
@@ -55,30 +57,48 @@ def log_complaint_created(sender, instance, created, **kwargs):
             actor=instance.user.email if instance.user else 'anonymous'
         )
         
+        # Only log complaints that were actually saved (no orphan events on rollback)
+        transaction.on_commit(partial(dispatch_complaint_event, instance.tracking_id, 'CREATED', payload))
+        
+    except Exception as e:
+        logger.error("Failed to dispatch blockchain event: %s", e)
+
+
+def dispatch_complaint_event(complaint_id: str, event_type: str, payload: dict):
+    """Hand a complaint event to the blockchain pipeline (run after commit)"""
+    try:
+        from blockchain import broker
+        from blockchain.event_queue import enqueue_complaint_event
+        from blockchain.tasks import flush_pending_events
+        
         # Development fallback: run synchronously if DEBUG or no Celery broker or EAGER mode
         if getattr(settings, 'DEBUG', False) or getattr(settings, 'CELERY_TASK_ALWAYS_EAGER', False):
-            logger.info(f"Running blockchain task synchronously (DEBUG/EAGER mode)")
+            logger.info("Running blockchain task synchronously (DEBUG/EAGER mode)")
             try:
-                from blockchain.services import BlockchainService
-                service = BlockchainService()
-                blockchain_tx = service.log_complaint_event(instance.tracking_id, 'CREATED', payload)
+                from blockchain.services import get_blockchain_service
+                service = get_blockchain_service()
+                blockchain_tx = service.log_complaint_event(complaint_id, event_type, payload)
                 if blockchain_tx:
-                    logger.info(f"✅ Blockchain event logged synchronously: {instance.tracking_id} - {blockchain_tx.tx_hash}")
+                    logger.info("✅ Blockchain event logged synchronously: %s - %s", complaint_id, blockchain_tx.tx_hash)
                 else:
-                    logger.warning(f"⚠️  Blockchain event returned no transaction")
+                    logger.warning("⚠️  Blockchain event returned no transaction")
             except Exception as sync_e:
-                logger.error(f"Synchronous blockchain logging failed: {sync_e}")
+                logger.error("Synchronous blockchain logging failed: %s", sync_e)
         else:
-            # Production: dispatch async task
-            task_result = log_complaint_event_async.delay(
-                complaint_id=instance.tracking_id,
-                event_type='CREATED',
-                payload=payload
-            )
-            logger.info(f"📤 Dispatched blockchain event task: {instance.tracking_id} - CREATED (Task ID: {task_result.id})")
+            # Production: queue for the next batched transaction. A complaint
+            # is only created once, so repeat CREATED dispatches are dropped.
+            dedupe_key = f"bc:created:{complaint_id}" if event_type == 'CREATED' else None
+            queued = enqueue_complaint_event(complaint_id, event_type, payload, dedupe_key=dedupe_key)
+            if not queued:
+                logger.info("Skipped duplicate blockchain event: %s - %s", complaint_id, event_type)
+                return
+            
+            if queued >= settings.BLOCKCHAIN_EVENT_BATCH_SIZE:
+                broker.enqueue(flush_pending_events)
+            logger.info("📤 Queued blockchain event: %s - %s (%s waiting)", complaint_id, event_type, queued)
         
     except Exception as e:
-        logger.error(f"Failed to dispatch blockchain event: {e}")
+        logger.error("Failed to dispatch blockchain event: %s", e)
 
 
 # Note: The following signals are disabled because they require FieldTracker
@@ -126,9 +146,30 @@ def log_evidence_uploaded(complaint_id: str, file_path: str, file_hash: str, fil
         return
     
     try:
+        from blockchain import broker
+        from blockchain.event_queue import claim_dispatch, release_dispatch
         from blockchain.tasks import anchor_evidence_async
         
-        anchor_evidence_async.delay(
+        # EAGER mode runs without Redis, so there is nothing to claim there;
+        # if Redis is down, anchoring twice beats not anchoring at all
+        dedupe_key = None
+        if not getattr(settings, 'CELERY_TASK_ALWAYS_EAGER', False):
+            dedupe_key = f"bc:evidence:{complaint_id}:{file_hash}"
+            try:
+                claimed = claim_dispatch(dedupe_key)
+            except Exception as e:
+                logger.warning("Evidence de-dup claim failed, dispatching anyway: %s", e)
+                dedupe_key = None
+            else:
+                if not claimed:
+                    logger.info("Skipped duplicate evidence anchoring: %s - %s", complaint_id, file_path)
+                    return
+        
+        # Publishing happens after the response; if it fails, free the claim
+        # so a re-upload isn't blocked for DISPATCH_DEDUPE_TTL
+        broker.enqueue(
+            anchor_evidence_async,
+            on_failure=partial(release_dispatch, dedupe_key) if dedupe_key else None,
             complaint_id=complaint_id,
             file_hash=file_hash,
             file_path=file_path,
@@ -138,10 +179,10 @@ def log_evidence_uploaded(complaint_id: str, file_path: str, file_hash: str, fil
             }
         )
         
-        logger.info(f"Dispatched evidence anchoring: {complaint_id} - {file_path}")
+        logger.info("Dispatched evidence anchoring: %s - %s", complaint_id, file_path)
         
     except Exception as e:
-        logger.error(f"Failed to dispatch evidence anchoring: {e}")
+        logger.error("Failed to dispatch evidence anchoring: %s", e)
 
 
 # ============ Model Tracker Setup ============
@@ -11,7 +11,10 @@ Setup:
 1. pip install celery redis
 2. Start Redis: redis-server (or use Upstash)
 3. Start Celery worker: celery -A report_hub worker --loglevel=info --pool=solo
-4. Start Celery beat (for periodic tasks): celery -A report_hub beat --loglevel=info
+4. Optional: serve blockchain writes (network-bound) from green threads by
+   setting BLOCKCHAIN_TASK_QUEUE=bc_eventlet and starting:
+   celery -A report_hub worker -Q bc_eventlet -P eventlet -c 100 --loglevel=info
+5. Start Celery beat (for periodic tasks): celery -A report_hub beat --loglevel=info
 """
 
 import logging
@@ -20,6 +23,16 @@ from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
+# Escalation notifications below this count are sent by check_sla_violations itself
+NOTIFY_INLINE_LIMIT = 100
+
+RETRYABLE_EVENT_TYPES = ['CREATED', 'ASSIGNED', 'STATUS_UPDATED', 'RESOLVED', 'ESCALATED']
+
+# Redis lock held while check_sla_violations runs, shared by every worker
+# and host; the timeout frees it if a worker dies
+SLA_CHECK_LOCK_KEY = 'bc:sla_check_lock'
+SLA_CHECK_LOCK_TIMEOUT = 600
+
 
 @shared_task(
     bind=True,
@@ -37,26 +50,30 @@ def log_complaint_event_async(self, complaint_id: str, event_type: str, payload:
         event_type: Event type (CREATED, ASSIGNED, STATUS_UPDATED, RESOLVED)
         payload: Event payload to hash and log
     """
-    logger.info(f"📥 Task received: {complaint_id} - {event_type}")
+    logger.info("📥 Task received: %s - %s", complaint_id, event_type)
     
     try:
-        from blockchain.services import BlockchainService
+        from blockchain.services import get_blockchain_service
         
-        logger.info(f"🔗 Connecting to blockchain for {complaint_id}...")
-        service = BlockchainService()
+        logger.info("🔗 Connecting to blockchain for %s...", complaint_id)
+        service = get_blockchain_service()
         
-        logger.info(f"📤 Sending blockchain transaction for {complaint_id}...")
+        logger.info("📤 Sending blockchain transaction for %s...", complaint_id)
         blockchain_tx = service.log_complaint_event(complaint_id, event_type, payload)
         
         if not blockchain_tx:
             raise Exception("Blockchain write returned no transaction record")
         
-        logger.info(f"✅ Blockchain event logged successfully:")
-        logger.info(f"   Complaint ID: {complaint_id}")
-        logger.info(f"   Event Type: {event_type}")
-        logger.info(f"   Tx Hash: {blockchain_tx.tx_hash}")
-        logger.info(f"   Block: {blockchain_tx.block_number}")
-        logger.info(f"   Gas Used: {blockchain_tx.gas_used}")
+        logger.info(
+            "✅ Blockchain event logged successfully:\n"
+            "   Complaint ID: %s\n"
+            "   Event Type: %s\n"
+            "   Tx Hash: %s\n"
+            "   Block: %s\n"
+            "   Gas Used: %s",
+            complaint_id, event_type, blockchain_tx.tx_hash,
+            blockchain_tx.block_number, blockchain_tx.gas_used
+        )
         
         return {
             'success': True,
@@ -68,14 +85,92 @@ def log_complaint_event_async(self, complaint_id: str, event_type: str, payload:
         }
             
     except Exception as e:
-        logger.error(f"❌ Blockchain event failed for {complaint_id}: {e}")
-        logger.error(f"   Event Type: {event_type}")
-        logger.error(f"   Retry attempt: {self.request.retries}/{self.max_retries}")
+        logger.error(
+            "❌ Blockchain event failed for %s: %s\n"
+            "   Event Type: %s\n"
+            "   Retry attempt: %s/%s",
+            complaint_id, e, event_type, self.request.retries, self.max_retries
+        )
         
         # Raise exception to trigger retry
         raise
 
 
+@shared_task
+def flush_pending_events(max_batch: int = None):
+    """
+    Drain queued complaint events and log them in one transaction.
+    
+    Runs every few seconds from Celery Beat, and straight away when a
+    producer sees the queue reach a full batch. The batch is acknowledged
+    once its rows are stored. A batch that fails to send is split (see
+    _log_events_bisecting) so only the events that fail on their own go to
+    the dead-letter list for retry_failed_transactions.
+    """
+    from blockchain.event_queue import ack_pending_events, dead_letter_events, drain_pending_events
+    
+    max_batch = max_batch or settings.BLOCKCHAIN_EVENT_BATCH_SIZE
+    
+    try:
+        batch_key, events = drain_pending_events(max_batch)
+    except Exception as e:
+        logger.error("Could not read pending events: %s", e)
+        return {'error': str(e)}
+    
+    if not events:
+        return {'logged': 0}
+    
+    try:
+        from blockchain.services import get_blockchain_service
+        
+        service = get_blockchain_service()
+        logged, failed = _log_events_bisecting(service, events)
+        
+    except Exception as e:
+        # Nothing was sent; the unacknowledged batch is requeued later
+        logger.error("Complaint event batch could not be processed: %s", e)
+        return {'error': str(e)}
+    
+    # Left unacknowledged, the batch is requeued after PROCESSING_TIMEOUT
+    # and its stored events are skipped on the resend
+    try:
+        if failed:
+            dead_letter_events(batch_key, failed)
+        else:
+            ack_pending_events(batch_key)
+    except Exception as e:
+        logger.error("Could not acknowledge event batch %s: %s", batch_key, e)
+    
+    logger.info("✅ Logged %s complaint events, %s dead-lettered", logged, len(failed))
+    return {'logged': logged, 'dead_lettered': len(failed)}
+
+
+def _log_events_bisecting(service, events):
+    """
+    Log events in one transaction, halving a batch that fails to send.
+    
+    One event the contract rejects would otherwise sink every batch it
+    joins; splitting isolates it in about log2(n) extra sends. While the
+    node is unreachable nothing is split and the whole batch fails.
+    
+    Returns:
+        (number of events logged, events that failed to send)
+    """
+    try:
+        return len(service.log_complaint_events_batch(events)), []
+    except Exception as e:
+        if len(events) == 1 or not service.w3.is_connected():
+            logger.error("Complaint events failed to send (%s events): %s", len(events), e)
+            return 0, events
+        
+        logger.warning("Complaint event batch of %s failed, splitting it: %s", len(events), e)
+    
+    middle = len(events) // 2
+    logged_first, failed_first = _log_events_bisecting(service, events[:middle])
+    logged_second, failed_second = _log_events_bisecting(service, events[middle:])
+    return logged_first + logged_second, failed_first + failed_second
+
+
 @shared_task(
     bind=True,
     autoretry_for=(Exception,),
@@ -99,14 +194,14 @@ def anchor_evidence_async(
         file_path: Local file path (relative to MEDIA_ROOT)
         file_metadata: Optional metadata dict
     """
-    logger.info(f"📥 Evidence anchoring task received: {complaint_id} - {file_path}")
+    logger.info("📥 Evidence anchoring task received: %s - %s", complaint_id, file_path)
     
     try:
-        from blockchain.services import BlockchainService
+        from blockchain.services import get_blockchain_service
         
-        service = BlockchainService()
+        service = get_blockchain_service()
         
-        logger.info(f"📤 Anchoring evidence on blockchain: {file_path}")
+        logger.info("📤 Anchoring evidence on blockchain: %s", file_path)
         evidence_record = service.anchor_evidence(
             complaint_id,
             file_hash,
@@ -117,11 +212,14 @@ def anchor_evidence_async(
         if not evidence_record:
             raise Exception("Evidence anchoring returned no record")
         
-        logger.info(f"✅ Evidence anchored successfully:")
-        logger.info(f"   Complaint ID: {complaint_id}")
-        logger.info(f"   File: {file_path}")
-        logger.info(f"   Tx Hash: {evidence_record.tx_hash}")
-        logger.info(f"   Block Timestamp: {evidence_record.block_timestamp}")
+        logger.info(
+            "✅ Evidence anchored successfully:\n"
+            "   Complaint ID: %s\n"
+            "   File: %s\n"
+            "   Tx Hash: %s\n"
+            "   Block Timestamp: %s",
+            complaint_id, file_path, evidence_record.tx_hash, evidence_record.block_timestamp
+        )
         
         return {
             'success': True,
@@ -132,8 +230,11 @@ def anchor_evidence_async(
         }
             
     except Exception as e:
-        logger.error(f"❌ Evidence anchoring failed for {file_path}: {e}")
-        logger.error(f"   Retry attempt: {self.request.retries}/{self.max_retries}")
+        logger.error(
+            "❌ Evidence anchoring failed for %s: %s\n"
+            "   Retry attempt: %s/%s",
+            file_path, e, self.request.retries, self.max_retries
+        )
         
         # Raise exception to trigger retry
         raise
@@ -154,23 +255,26 @@ def set_sla_deadline_async(self, complaint_id: str, hours: int = 48):
         complaint_id: Complaint identifier
         hours: Hours until deadline
     """
-    logger.info(f"📥 SLA deadline task received: {complaint_id} - {hours}h")
+    logger.info("📥 SLA deadline task received: %s - %sh", complaint_id, hours)
     
     try:
-        from blockchain.services import BlockchainService
+        from blockchain.services import get_blockchain_service
         
-        service = BlockchainService()
+        service = get_blockchain_service()
         
-        logger.info(f"📤 Setting SLA deadline on blockchain: {complaint_id}")
+        logger.info("📤 Setting SLA deadline on blockchain: %s", complaint_id)
         sla_record = service.set_sla_deadline(complaint_id, hours)
         
         if not sla_record:
             raise Exception("SLA deadline setting returned no record")
         
-        logger.info(f"✅ SLA deadline set successfully:")
-        logger.info(f"   Complaint ID: {complaint_id}")
-        logger.info(f"   Deadline: {sla_record.deadline}")
-        logger.info(f"   Tx Hash: {sla_record.tx_hash}")
+        logger.info(
+            "✅ SLA deadline set successfully:\n"
+            "   Complaint ID: %s\n"
+            "   Deadline: %s\n"
+            "   Tx Hash: %s",
+            complaint_id, sla_record.deadline, sla_record.tx_hash
+        )
         
         return {
             'success': True,
@@ -181,8 +285,11 @@ def set_sla_deadline_async(self, complaint_id: str, hours: int = 48):
         }
             
     except Exception as e:
-        logger.error(f"❌ SLA deadline setting failed for {complaint_id}: {e}")
-        logger.error(f"   Retry attempt: {self.request.retries}/{self.max_retries}")
+        logger.error(
+            "❌ SLA deadline setting failed for %s: %s\n"
+            "   Retry attempt: %s/%s",
+            complaint_id, e, self.request.retries, self.max_retries
+        )
         
         # Raise exception to trigger retry
         raise
@@ -190,7 +297,7 @@ def set_sla_deadline_async(self, complaint_id: str, hours: int = 48):
         try:
             self.retry(exc=e, countdown=60 * (2 ** self.request.retries))
         except self.MaxRetriesExceededError:
-            logger.error(f"Max retries exceeded for SLA {complaint_id}")
+            logger.error("Max retries exceeded for SLA %s", complaint_id)
             
         return {
             'success': False,
@@ -216,37 +323,46 @@ def check_sla_violations():
         },
     }
     """
+    import redis
+    from blockchain.event_queue import get_redis_client
+    
+    # Overlapping beat ticks would pick the same rows and pay gas twice
+    lock = get_redis_client().lock(SLA_CHECK_LOCK_KEY, timeout=SLA_CHECK_LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        logger.info("SLA check already running, skipping")
+        return {'checked': 0, 'escalated': 0}
+    
     try:
         from blockchain.models import SLATracker
         from blockchain.services import get_blockchain_service
-        from django.utils import timezone
         import time
         
-        service = get_blockchain_service()
-        
         # Get non-escalated complaints nearing deadline
         current_timestamp = int(time.time())
         
-        # Find complaints that might need escalation
-        trackers = SLATracker.objects.filter(
+        # Find complaints that might need escalation (one query)
+        complaint_ids = list(SLATracker.objects.filter(
             escalated=False,
             sla_deadline__lte=current_timestamp
-        )[:50]  # Batch size
+        ).values_list('complaint_id', flat=True)[:50])  # Batch size
         
-        if not trackers.exists():
+        if not complaint_ids:
             logger.info("No SLA violations found")
             return {'checked': 0, 'escalated': 0}
         
-        complaint_ids = [t.complaint_id for t in trackers]
-        
         # Batch check and escalate on blockchain
-        escalated_count = service.batch_check_and_escalate(complaint_ids)
+        escalated_count = get_blockchain_service().batch_check_and_escalate(complaint_ids)
         
-        logger.warning(f"SLA check complete: {len(complaint_ids)} checked, {escalated_count} escalated")
+        logger.warning("SLA check complete: %s checked, %s escalated", len(complaint_ids), escalated_count)
         
-        # Send notifications for escalated complaints
+        # Send notifications for escalated complaints; a handful is cheaper
+        # to send here than to publish and schedule as another task
         if escalated_count > 0:
-            send_escalation_notifications.delay(complaint_ids[:escalated_count])
+            escalated_ids = complaint_ids[:escalated_count]
+            if len(escalated_ids) < NOTIFY_INLINE_LIMIT:
+                send_escalation_notifications(escalated_ids)
+            else:
+                send_escalation_notifications.delay(escalated_ids)
         
         return {
             'checked': len(complaint_ids),
@@ -254,8 +370,15 @@ def check_sla_violations():
         }
         
     except Exception as e:
-        logger.error(f"SLA check task failed: {e}")
+        logger.error("SLA check task failed: %s", e)
         return {'error': str(e)}
+    
+    finally:
+        try:
+            lock.release()
+        except redis.RedisError as e:
+            # Expired or unreachable; it times out on its own
+            logger.warning("Could not release SLA check lock: %s", e)
 
 
 @shared_task
@@ -277,7 +400,7 @@ def send_escalation_notifications(complaint_ids: list):
             # - Dashboard notifications
             # - Slack/Teams webhooks
             
-            logger.warning(f"ESCALATION ALERT: {complaint_id}")
+            logger.warning("ESCALATION ALERT: %s", complaint_id)
             
             # Example:
             # send_escalation_alert(complaint_id)
@@ -285,7 +408,7 @@ def send_escalation_notifications(complaint_ids: list):
         return {'notified': len(complaint_ids)}
         
     except Exception as e:
-        logger.error(f"Notification task failed: {e}")
+        logger.error("Notification task failed: %s", e)
         return {'error': str(e)}
 
 
@@ -297,18 +420,44 @@ def sync_blockchain_events():
     This listens for events emitted by the smart contract and updates
     the local database accordingly.
     
-    Schedule with Celery Beat every 5-10 minutes.
+    The listen_blockchain_events command persists events in real time;
+    schedule this hourly with Celery Beat as the reconciler.
     """
     try:
         from blockchain.listeners import sync_events_from_blockchain
         
         result = sync_events_from_blockchain()
         
-        logger.info(f"Blockchain sync: {result}")
+        logger.info("Blockchain sync: %s", result)
         return result
         
     except Exception as e:
-        logger.error(f"Blockchain sync failed: {e}")
+        logger.error("Blockchain sync failed: %s", e)
+        return {'error': str(e)}
+
+
+@shared_task
+def poll_pending_transactions():
+    """
+    Periodic task to confirm transactions sent without waiting for a receipt.
+    
+    Schedule with Celery Beat (e.g., every minute).
+    """
+    try:
+        from blockchain.services import get_blockchain_service
+        
+        service = get_blockchain_service()
+        counts = service.poll_pending_transactions()
+        
+        if counts['confirmed'] or counts['failed']:
+            logger.info(
+                "Settled pending transactions: %s confirmed, %s failed",
+                counts['confirmed'], counts['failed']
+            )
+        return counts
+        
+    except Exception as e:
+        logger.error("Pending transaction poll failed: %s", e)
         return {'error': str(e)}
 
 
@@ -328,24 +477,30 @@ def retry_failed_transactions():
         cutoff = timezone.now() - timedelta(hours=24)
         failed_txs = BlockchainTransaction.objects.filter(
             status='FAILED',
-            timestamp__gte=cutoff
-        )[:10]  # Limit retries
-        
-        retry_count = 0
+            timestamp__gte=cutoff,
+            event_type__in=RETRYABLE_EVENT_TYPES
+        ).only('complaint_id', 'event_type', 'event_payload')[:10]  # Limit retries
+        
+        from blockchain.broker import publish_many
+        
+        # Retry based on event type, published over one broker connection
+        retry_count = publish_many(
+            (log_complaint_event_async, {
+                'complaint_id': tx.complaint_id,
+                'event_type': tx.event_type,
+                'payload': tx.event_payload
+            })
+            for tx in failed_txs
+        )
         
-        for tx in failed_txs:
-            # Retry based on event type
-            if tx.event_type in ['CREATED', 'ASSIGNED', 'STATUS_UPDATED', 'RESOLVED', 'ESCALATED']:
-                log_complaint_event_async.delay(
-                    tx.complaint_id,
-                    tx.event_type,
-                    tx.event_payload
-                )
-                retry_count += 1
+        # Events from failed or abandoned batches go back onto the batch queue
+        from blockchain.event_queue import requeue_abandoned_batches, requeue_failed_events
+        requeue_abandoned_batches()
+        requeued = requeue_failed_events(settings.BLOCKCHAIN_EVENT_BATCH_SIZE)
         
-        logger.info(f"Retried {retry_count} failed transactions")
-        return {'retried': retry_count}
+        logger.info("Retried %s failed transactions, requeued %s events", retry_count, requeued)
+        return {'retried': retry_count, 'requeued': requeued}
         
     except Exception as e:
-        logger.error(f"Retry task failed: {e}")
+        logger.error("Retry task failed: %s", e)
         return {'error': str(e)}
@@ -0,0 +1,134 @@
+import json
+
+from django.contrib.admin.sites import AdminSite
+from django.test import RequestFactory, SimpleTestCase, TestCase
+
+from .admin import BlockchainTransactionAdmin
+from .models import BlockchainTransaction, EvidenceHash
+from .utils import HashField, canonical_payload_bytes
+
+TX_HASH = '0x' + 'ab' * 32
+FILE_HASH = 'cd' * 32
+
+
+class HashFieldTests(SimpleTestCase):
+    def test_prep_value_strips_prefix(self):
+        field = HashField()
+        
+        self.assertEqual(field.get_prep_value(TX_HASH), bytes.fromhex('ab' * 32))
+        self.assertEqual(field.get_prep_value(TX_HASH.upper()), bytes.fromhex('ab' * 32))
+        self.assertEqual(field.get_prep_value('ab' * 32), bytes.fromhex('ab' * 32))
+    
+    def test_prep_value_passes_through_bytes_and_none(self):
+        field = HashField()
+        
+        self.assertIsNone(field.get_prep_value(None))
+        self.assertEqual(field.get_prep_value(b'\x01\x02'), b'\x01\x02')
+        self.assertEqual(field.get_prep_value(''), b'')
+    
+    def test_prep_value_non_hex(self):
+        # Search terms that aren't digests can't match any stored hash
+        self.assertEqual(HashField().get_prep_value('not-a-hash'), b'not-a-hash')
+    
+    def test_from_db_value(self):
+        raw = bytes.fromhex('ab' * 32)
+        
+        self.assertEqual(HashField().from_db_value(raw, None, None), TX_HASH)
+        self.assertEqual(HashField().from_db_value(memoryview(raw), None, None), TX_HASH)
+        self.assertEqual(HashField(prefixed=False).from_db_value(raw, None, None), 'ab' * 32)
+        self.assertEqual(HashField().from_db_value(b'', None, None), '')
+        self.assertIsNone(HashField().from_db_value(None, None, None))
+    
+    def test_to_python(self):
+        raw = bytes.fromhex('ab' * 32)
+        
+        self.assertEqual(HashField().to_python(raw), TX_HASH)
+        self.assertEqual(HashField().to_python(TX_HASH), TX_HASH)
+    
+    def test_deconstruct(self):
+        name, path, args, kwargs = HashField(help_text='x').deconstruct()
+        self.assertEqual(path, 'blockchain.utils.HashField')
+        self.assertNotIn('prefixed', kwargs)
+        
+        name, path, args, kwargs = HashField(prefixed=False, null=True).deconstruct()
+        self.assertEqual(kwargs, {'prefixed': False, 'null': True})
+        self.assertFalse(HashField(*args, **kwargs).prefixed)
+
+
+class CanonicalPayloadBytesTests(SimpleTestCase):
+    def test_matches_json_dumps(self):
+        payloads = [
+            {'b': 1, 'a': 'x', 'nested': {'z': [1, 2.5, True, None]}},
+            {'del': 'a\x7fb'},
+            {'control': '\x00\x1f\n"\\'},
+            {'unicode': 'caf\u00e9 \u2603 \U0001f600'},
+            {'nan': float('nan'), 'inf': float('inf'), 'ninf': float('-inf')},
+            {'small': 1e-7, 'big': 1e22, 'neg_zero': -0.0},
+            {'huge_int': 2 ** 70, 'int': -(2 ** 63)},
+            {'none': None, 'text': 'null'},
+            {},
+        ]
+        
+        for payload in payloads:
+            with self.subTest(payload=payload):
+                self.assertEqual(
+                    canonical_payload_bytes(payload),
+                    json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('ascii')
+                )
+
+
+class HashFieldQueryTests(TestCase):
+    def _create_tx(self, tx_hash=TX_HASH, **kwargs):
+        return BlockchainTransaction.objects.create(
+            complaint_id='ABC123',
+            event_type='CREATED',
+            event_hash='0x' + '11' * 32,
+            tx_hash=tx_hash,
+            status='PENDING',
+            event_payload={'a': 1},
+            **kwargs
+        )
+    
+    def test_round_trip(self):
+        tx = self._create_tx()
+        
+        stored = BlockchainTransaction.objects.get(pk=tx.pk)
+        self.assertEqual(stored.tx_hash, TX_HASH)
+        self.assertEqual(stored.event_hash, '0x' + '11' * 32)
+    
+    def test_unprefixed_round_trip(self):
+        evidence = EvidenceHash.objects.create(
+            complaint_id='ABC123',
+            file_hash=FILE_HASH,
+            file_path='evidence/a.jpg',
+            tx_hash=TX_HASH,
+            block_timestamp=0
+        )
+        
+        stored = EvidenceHash.objects.get(pk=evidence.pk)
+        self.assertEqual(stored.file_hash, FILE_HASH)
+        self.assertEqual(stored.tx_hash, TX_HASH)
+    
+    def test_lookups(self):
+        tx = self._create_tx()
+        
+        self.assertEqual(BlockchainTransaction.objects.get(tx_hash=TX_HASH).pk, tx.pk)
+        self.assertEqual(BlockchainTransaction.objects.get(tx_hash='ab' * 32).pk, tx.pk)
+        self.assertTrue(BlockchainTransaction.objects.filter(tx_hash__in=[TX_HASH]).exists())
+        self.assertFalse(BlockchainTransaction.objects.filter(tx_hash='0x' + 'ef' * 32).exists())
+    
+    def test_unsent_rows_are_null(self):
+        self._create_tx(tx_hash=None, event_index=0)
+        self._create_tx(tx_hash=None, event_index=0)
+        
+        self.assertEqual(BlockchainTransaction.objects.filter(tx_hash__isnull=True).count(), 2)
+    
+    def test_admin_search_by_tx_hash(self):
+        tx = self._create_tx()
+        model_admin = BlockchainTransactionAdmin(BlockchainTransaction, AdminSite())
+        request = RequestFactory().get('/')
+        
+        results, _ = model_admin.get_search_results(
+            request, BlockchainTransaction.objects.all(), TX_HASH
+        )
+        self.assertEqual([row.pk for row in results], [tx.pk])
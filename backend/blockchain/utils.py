@@ -4,7 +4,208 @@ Utility functions for blockchain integration
 
 import hashlib
 import json
-from typing import Dict, Any
+import re
+import time
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Union
+
+import orjson
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.signals import setting_changed
+from django.db import models
+from django.dispatch import receiver
+
+
+# zlib level for stored payloads; 6 is the usual size/speed sweet spot
+PAYLOAD_COMPRESSION_LEVEL = 6
+
+# Read size for streaming evidence files
+FILE_CHUNK_SIZE = 1 << 20
+
+# A digit followed by an exponent marker: orjson writes 1e-7 where json writes 1e-07
+_EXPONENT_RE = re.compile(rb'\d[eE]')
+
+
+def canonical_payload_bytes(payload: Dict) -> bytes:
+    """
+    Canonical JSON bytes of an event payload, as hashed for the chain.
+    
+    The canonical form is json.dumps(sort_keys=True, separators=(',', ':'))
+    since existing on-chain hashes were computed over it. orjson produces the
+    same bytes for ASCII payloads without float exponents, which covers
+    nearly every event, and is several times faster. Anything else goes
+    through json so the bytes never change: non-ASCII text, DEL (json
+    escapes it as \\u007f), exponents, any null (orjson also writes NaN and
+    Infinity as null) and values orjson rejects.
+    """
+    try:
+        data = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    except orjson.JSONEncodeError:
+        data = None
+    
+    if (
+        data is not None
+        and data.isascii()
+        and b'\x7f' not in data
+        and b'null' not in data
+        and not _EXPONENT_RE.search(data)
+    ):
+        return data
+    
+    return json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('ascii')
+
+
+def iter_file_chunks(file_obj: BinaryIO, chunk_size: int = FILE_CHUNK_SIZE) -> Iterator[memoryview]:
+    """
+    Yield a file's contents in chunks read into one reused buffer.
+    
+    Each chunk is a view of that buffer, so it must be consumed before the
+    next one is requested.
+    """
+    if not hasattr(file_obj, 'readinto'):
+        while chunk := file_obj.read(chunk_size):
+            yield memoryview(chunk)
+        return
+    
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    while n := file_obj.readinto(buf):
+        yield view[:n]
+
+
+def sha256_stream(file_obj: BinaryIO) -> str:
+    """
+    SHA-256 hex digest of a binary file object, read to the end.
+    
+    hashlib.file_digest (Python 3.11+) runs the whole loop in C on OpenSSL,
+    which uses the CPU's SHA extensions where present.
+    """
+    if hasattr(hashlib, 'file_digest'):
+        return hashlib.file_digest(file_obj, 'sha256').hexdigest()
+    
+    file_hash = hashlib.sha256()
+    for chunk in iter_file_chunks(file_obj):
+        file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def sha256_file(path: Union[str, Path]) -> str:
+    """SHA-256 hex digest of the file at path"""
+    with open(path, 'rb') as f:
+        return sha256_stream(f)
+
+
+class OrjsonEncoder(DjangoJSONEncoder):
+    """
+    JSON encoder for JSONFields backed by orjson.
+    
+    Django calls json.dumps(value, cls=encoder), which ends up in encode();
+    orjson does the serialization in C. Values orjson rejects (e.g. ints
+    wider than 64 bits) fall back to the stdlib path.
+    """
+    
+    def encode(self, o):
+        try:
+            return orjson.dumps(
+                o,
+                default=self.default,
+                option=orjson.OPT_NON_STR_KEYS
+            ).decode()
+        except orjson.JSONEncodeError:
+            return super().encode(o)
+
+
+class CompressedJSONField(models.BinaryField):
+    """
+    JSON value stored as zlib-compressed orjson bytes.
+    
+    For opaque audit data that is only ever read back whole, never
+    filtered on with JSON lookups. Values round-trip like a JSONField.
+    """
+    
+    _encoder = OrjsonEncoder()
+    
+    def get_prep_value(self, value):
+        if value is None:
+            return None
+        
+        data = self._encoder.encode(value).encode()
+        return super().get_prep_value(zlib.compress(data, PAYLOAD_COMPRESSION_LEVEL))
+    
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return orjson.loads(zlib.decompress(value))
+    
+    def to_python(self, value):
+        if isinstance(value, (bytes, memoryview)):
+            return orjson.loads(zlib.decompress(value))
+        return value
+    
+    def value_to_string(self, obj):
+        return self._encoder.encode(self.value_from_object(obj))
+
+
+class HashField(models.Field):
+    """
+    32-byte digest stored as raw bytes, exposed as a hex string.
+    
+    Half the size of the hex CharField it replaces, in the column and in
+    its indexes. Python code keeps using hex strings: values (and lookups)
+    are converted on the way in and out. An empty string is stored as
+    empty bytes.
+    
+    Args:
+        prefixed: Return values with a '0x' prefix (tx/event hashes) or
+            without (SHA-256 file hashes)
+    """
+    
+    description = "32-byte hash"
+    
+    def __init__(self, *args, prefixed: bool = True, **kwargs):
+        self.prefixed = prefixed
+        super().__init__(*args, **kwargs)
+    
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if not self.prefixed:
+            kwargs['prefixed'] = False
+        return name, path, args, kwargs
+    
+    def db_type(self, connection):
+        return {
+            'mysql': 'varbinary(32)',
+            'postgresql': 'bytea',
+            'oracle': 'RAW(32)',
+        }.get(connection.vendor, 'blob')
+    
+    def _to_hex(self, value: bytes) -> str:
+        if not value:
+            return ''
+        return ('0x' if self.prefixed else '') + bytes(value).hex()
+    
+    def get_prep_value(self, value):
+        value = super().get_prep_value(value)
+        if value is None or isinstance(value, bytes):
+            return value
+        try:
+            return bytes.fromhex(value[2:] if value.startswith(('0x', '0X')) else value)
+        except ValueError:
+            # Not a hex digest (e.g. an admin search term); it can't match
+            return value.encode()
+    
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return self._to_hex(value)
+    
+    def to_python(self, value):
+        if isinstance(value, (bytes, memoryview)):
+            return self._to_hex(value)
+        return value
 
 
 def create_event_payload(
@@ -25,12 +226,10 @@ def create_event_payload(
     Returns:
         Standardized payload dictionary
     """
-    import time
-    
     payload = {
         'complaint_id': complaint_id,
         'event_type': event_type,
-        'timestamp': int(time.time()),
+        'timestamp': time.time_ns() // 1_000_000_000,
         'data': data
     }
     
@@ -40,6 +239,11 @@ def create_event_payload(
     return payload
 
 
+# Tracking ids are uppercase alphanumerics (report serializer); a single
+# character class can't backtrack, so stdlib re stays linear-time
+_COMPLAINT_ID_RE = re.compile(r'[A-Z0-9\-]{1,100}')
+
+
 def validate_complaint_id(complaint_id: str) -> bool:
     """
     Validate complaint ID format.
@@ -50,13 +254,10 @@ def validate_complaint_id(complaint_id: str) -> bool:
     Returns:
         True if valid
     """
-    if not complaint_id or not isinstance(complaint_id, str):
+    if not isinstance(complaint_id, str):
         return False
     
-    if len(complaint_id) > 100:
-        return False
-    
-    return True
+    return _COMPLAINT_ID_RE.fullmatch(complaint_id) is not None
 
 
 def format_blockchain_response(tx_hash: str, status: str, details: Dict = None) -> Dict:
@@ -83,7 +284,7 @@ def format_blockchain_response(tx_hash: str, status: str, details: Dict = None)
     return response
 
 
-def get_explorer_url(tx_hash: str) -> str:
+def get_explorer_url(tx_hash: Optional[str]) -> Optional[str]:
     """
     Get blockchain explorer URL for transaction.
     
@@ -91,12 +292,29 @@ def get_explorer_url(tx_hash: str) -> str:
         tx_hash: Transaction hash
         
     Returns:
-        Explorer URL
+        Explorer URL, or None for an unsent transaction or when
+        BLOCKCHAIN_EXPLORER_URL is set to None
     """
-    from django.conf import settings
+    base = _explorer_tx_base()
+    if base is None or not tx_hash:
+        return None
     
+    return base + tx_hash
+
+
+@lru_cache(maxsize=1)
+def _explorer_tx_base() -> Optional[str]:
     base_url = getattr(settings, 'BLOCKCHAIN_EXPLORER_URL', 'https://etherscan.io')
-    return f"{base_url}/tx/{tx_hash}"
+    if base_url is None:
+        return None
+    
+    return base_url.rstrip('/') + '/tx/'
+
+
+@receiver(setting_changed)
+def _reset_explorer_url(sender, setting, **kwargs):
+    if setting == 'BLOCKCHAIN_EXPLORER_URL':
+        _explorer_tx_base.cache_clear()
 
 
 def truncate_hash(hash_str: str, prefix_len: int = 10, suffix_len: int = 8) -> str:
@@ -117,6 +335,29 @@ def truncate_hash(hash_str: str, prefix_len: int = 10, suffix_len: int = 8) -> s
     return f"{hash_str[:prefix_len]}...{hash_str[-suffix_len:]}"
 
 
+def truncate_hashes_bulk(hashes: List[str], prefix_len: int = 10, suffix_len: int = 8) -> List[str]:
+    """
+    truncate_hash for a whole column of hashes (e.g. an audit table).
+    
+    Args:
+        hashes: Full hash strings
+        prefix_len: Number of characters to show at start
+        suffix_len: Number of characters to show at end
+        
+    Returns:
+        Truncated hashes, in order
+    """
+    max_len = prefix_len + suffix_len
+    return [
+        h if len(h) <= max_len else h[:prefix_len] + '...' + h[-suffix_len:]
+        for h in hashes
+    ]
+
+
+# You could fetch ETH price from an API for USD estimate
+ETH_PRICE_USD = 3000  # Placeholder
+
+
 def estimate_gas_cost(gas_used: int, gas_price_gwei: float) -> Dict:
     """
     Estimate transaction cost in ETH and USD.
@@ -132,9 +373,7 @@ def estimate_gas_cost(gas_used: int, gas_price_gwei: float) -> Dict:
     cost_wei = gas_used * gas_price_wei
     cost_eth = cost_wei / 1e18
     
-    # You could fetch ETH price from an API for USD estimate
-    eth_price_usd = 3000  # Placeholder
-    cost_usd = cost_eth * eth_price_usd
+    cost_usd = cost_eth * ETH_PRICE_USD
     
     return {
         'gas_used': gas_used,
@@ -142,3 +381,37 @@ def estimate_gas_cost(gas_used: int, gas_price_gwei: float) -> Dict:
         'cost_eth': round(cost_eth, 6),
         'cost_usd': round(cost_usd, 2)
     }
+
+
+def estimate_gas_costs_bulk(gas_used, gas_price_gwei, eth_price_usd: float = ETH_PRICE_USD):
+    """
+    Vectorized estimate_gas_cost for many transactions at once.
+    
+    Args:
+        gas_used: Sequence or array of gas units used
+        gas_price_gwei: Gas price in Gwei, one per transaction or a single value
+        eth_price_usd: ETH price used for the USD estimate
+        
+    Returns:
+        NumPy structured array with gas_used, gas_price_gwei, cost_eth and
+        cost_usd fields, rounded like estimate_gas_cost
+    """
+    import numpy as np
+    
+    gas = np.asarray(gas_used, dtype=np.float64)
+    price = np.broadcast_to(np.asarray(gas_price_gwei, dtype=np.float64), gas.shape)
+    
+    result = np.empty(gas.shape, dtype=[
+        ('gas_used', np.int64),
+        ('gas_price_gwei', np.float64),
+        ('cost_eth', np.float64),
+        ('cost_usd', np.float64),
+    ])
+    result['gas_used'] = gas
+    result['gas_price_gwei'] = price
+    
+    cost_eth = gas * price * 1e-9
+    result['cost_eth'] = np.round(cost_eth, 6)
+    result['cost_usd'] = np.round(cost_eth * eth_price_usd, 2)
+    
+    return result
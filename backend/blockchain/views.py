@@ -5,15 +5,31 @@ Add these to your report/views.py or import them in urls.py
 """
 
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
-from django.conf import settings
+from django.http import StreamingHttpResponse
 
+from blockchain import broker
+from blockchain.ipfs_service import get_local_storage_service
+from blockchain.models import BlockchainTransaction, EvidenceHash
+from blockchain.renderers import OrjsonRenderer
+from blockchain.services import get_blockchain_service
+from blockchain.signals import log_evidence_uploaded
+from blockchain.utils import get_explorer_url
+from report.models import IssueReport
+
+import itertools
 import logging
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
+# Audit-trail rows read, verified and sent per round
+AUDIT_TRAIL_CHUNK_SIZE = 500
+
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -36,11 +52,6 @@ def upload_evidence_with_blockchain(request, tracking_id):
     }
     """
     try:
-        from report.models import IssueReport
-        from blockchain.ipfs_service import get_local_storage_service
-        from blockchain.services import get_blockchain_service
-        from blockchain.signals import log_evidence_uploaded
-        
         # Get complaint
         try:
             complaint = IssueReport.objects.get(tracking_id=tracking_id)
@@ -65,13 +76,12 @@ def upload_evidence_with_blockchain(request, tracking_id):
             )
         
         uploaded_file = request.FILES['file']
-        file_content = uploaded_file.read()
         file_name = uploaded_file.name
         
-        # Save to local storage
+        # Save to local storage, hashing while the file is streamed to disk
         storage_service = get_local_storage_service()
-        file_path, file_url = storage_service.upload_file(
-            file_content, 
+        file_path, file_url, file_hash = storage_service.upload_file_with_hash(
+            uploaded_file,
             file_name,
             complaint_id=tracking_id
         )
@@ -82,11 +92,9 @@ def upload_evidence_with_blockchain(request, tracking_id):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
         
-        # Compute file hash
-        file_hash = storage_service.compute_file_hash(file_content)
-        
-        # Trigger blockchain anchoring (async)
-        log_evidence_uploaded(
+        # Trigger blockchain anchoring (async), once the response is sent
+        broker.after_response(
+            log_evidence_uploaded,
             complaint_id=tracking_id,
             file_path=file_path,
             file_hash=file_hash,
@@ -130,8 +138,6 @@ def verify_evidence_integrity(request, tracking_id):
     }
     """
     try:
-        from blockchain.services import get_blockchain_service
-        
         # Get uploaded file
         if 'file' not in request.FILES:
             return Response(
@@ -140,13 +146,12 @@ def verify_evidence_integrity(request, tracking_id):
             )
         
         uploaded_file = request.FILES['file']
-        file_content = uploaded_file.read()
         
-        # Verify against blockchain
+        # Verify against blockchain (the upload is hashed as a stream)
         service = get_blockchain_service()
         verified, details = service.verify_evidence_integrity(
             tracking_id,
-            file_content
+            uploaded_file
         )
         
         if verified:
@@ -170,6 +175,7 @@ def verify_evidence_integrity(request, tracking_id):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@renderer_classes([OrjsonRenderer, BrowsableAPIRenderer])
 def get_blockchain_status(request, tracking_id):
     """
     Get blockchain status for a complaint.
@@ -186,42 +192,47 @@ def get_blockchain_status(request, tracking_id):
     }
     """
     try:
-        from report.models import IssueReport
-        from blockchain.models import BlockchainTransaction, EvidenceHash, SLATracker
-        from blockchain.services import get_blockchain_service
-        
-        # Get complaint
-        try:
-            complaint = IssueReport.objects.get(tracking_id=tracking_id)
-        except IssueReport.DoesNotExist:
+        # Check the complaint exists without loading the row
+        if not IssueReport.objects.filter(tracking_id=tracking_id).exists():
             return Response(
                 {"error": "Complaint not found"},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Get blockchain transactions
-        transactions = BlockchainTransaction.objects.filter(
+        # Get blockchain transactions as plain rows (no model instances);
+        # ordered newest-first by the (complaint_id, -timestamp) index
+        transactions = list(BlockchainTransaction.objects.filter(
             complaint_id=tracking_id
-        ).order_by('-timestamp')
+        ).order_by('-timestamp').values_list(
+            'event_type', 'tx_hash', 'block_number', 'timestamp', 'status',
+            named=True
+        ))
         
         # Get evidence records
-        evidence_records = EvidenceHash.objects.filter(
+        evidence_records = list(EvidenceHash.objects.filter(
             complaint_id=tracking_id
-        ).order_by('-created_at')
+        ).order_by('-created_at').values_list(
+            'file_name', 'file_path', 'file_hash', 'tx_hash',
+            'verified', 'block_timestamp', 'created_at',
+            named=True
+        ))
         
         # Get SLA status
         service = get_blockchain_service()
         sla_status = service.get_sla_status(tracking_id)
         
-        # Import local storage service to generate URLs
-        from blockchain.ipfs_service import get_local_storage_service
+        # Local storage service generates the evidence URLs
         storage_service = get_local_storage_service()
+        file_urls = storage_service.get_file_urls_bulk(
+            [ev.file_path for ev in evidence_records]
+        )
         
+        # IssueReport has no blockchain columns; derive them from the rows above
         return Response({
             "tracking_id": tracking_id,
-            "blockchain_verified": complaint.blockchain_verified,
-            "sla_escalated": complaint.sla_escalated,
-            "latest_tx_hash": complaint.blockchain_tx_hash,
+            "blockchain_verified": any(tx.status == 'CONFIRMED' for tx in transactions),
+            "sla_escalated": bool(sla_status and sla_status['escalated']),
+            "latest_tx_hash": transactions[0].tx_hash if transactions else None,
             "events": [
                 {
                     "event_type": tx.event_type,
@@ -229,7 +240,7 @@ def get_blockchain_status(request, tracking_id):
                     "block_number": tx.block_number,
                     "timestamp": tx.timestamp,
                     "status": tx.status,
-                    "explorer_url": f"{settings.BLOCKCHAIN_EXPLORER_URL}/tx/{tx.tx_hash}" if hasattr(settings, 'BLOCKCHAIN_EXPLORER_URL') else None
+                    "explorer_url": get_explorer_url(tx.tx_hash)
                 }
                 for tx in transactions
             ],
@@ -237,7 +248,7 @@ def get_blockchain_status(request, tracking_id):
                 {
                     "file_name": ev.file_name,
                     "file_path": ev.file_path,
-                    "file_url": storage_service.get_file_url(ev.file_path),
+                    "file_url": file_urls[ev.file_path],
                     "file_hash": ev.file_hash,
                     "tx_hash": ev.tx_hash,
                     "verified": ev.verified,
@@ -259,6 +270,7 @@ def get_blockchain_status(request, tracking_id):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@renderer_classes([OrjsonRenderer, BrowsableAPIRenderer])
 def get_complaint_audit_trail(request, tracking_id):
     """
     Get complete audit trail for a complaint from blockchain.
@@ -278,43 +290,42 @@ def get_complaint_audit_trail(request, tracking_id):
                 "verified": true
             },
             ...
-        ]
+        ],
+        "total_events": 1
     }
+    
+    Trails longer than one chunk are streamed, so they are never held in
+    memory whole. If a later chunk fails, the streamed document is closed
+    with an "error" field instead of being cut off.
     """
     try:
-        from blockchain.models import BlockchainTransaction
-        from blockchain.services import get_blockchain_service
-        
-        # Get all transactions for this complaint
-        transactions = BlockchainTransaction.objects.filter(
+        # Get all transactions for this complaint as plain rows, streamed
+        # from the cursor rather than materialized
+        rows = BlockchainTransaction.objects.filter(
             complaint_id=tracking_id,
             status='CONFIRMED'
-        ).order_by('timestamp')
+        ).order_by('timestamp').values_list(
+            'event_type', 'timestamp', 'tx_hash', 'block_number', 'event_hash', 'gas_used',
+            named=True
+        ).iterator(chunk_size=AUDIT_TRAIL_CHUNK_SIZE)
         
-        service = get_blockchain_service()
+        chunks = _audit_trail_chunks(tracking_id, rows)
         
-        audit_trail = []
+        # Build the first chunk now so DB/RPC failures still get a 500 below
+        first_chunk = next(chunks, [])
         
-        for tx in transactions:
-            # Verify each event on blockchain
-            verified = service.verify_event(tracking_id, tx.event_hash)
-            
-            audit_trail.append({
-                "event_type": tx.event_type,
-                "timestamp": tx.timestamp.isoformat(),
-                "tx_hash": tx.tx_hash,
-                "block_number": tx.block_number,
-                "event_hash": tx.event_hash,
-                "verified_on_chain": verified,
-                "gas_used": tx.gas_used,
-                "explorer_url": f"{settings.BLOCKCHAIN_EXPLORER_URL}/tx/{tx.tx_hash}" if hasattr(settings, 'BLOCKCHAIN_EXPLORER_URL') else None
-            })
+        # The whole trail fit in one chunk (the common case): plain response
+        if len(first_chunk) < AUDIT_TRAIL_CHUNK_SIZE:
+            return Response({
+                "tracking_id": tracking_id,
+                "events": first_chunk,
+                "total_events": len(first_chunk)
+            }, status=status.HTTP_200_OK)
         
-        return Response({
-            "tracking_id": tracking_id,
-            "total_events": len(audit_trail),
-            "events": audit_trail
-        }, status=status.HTTP_200_OK)
+        return StreamingHttpResponse(
+            _stream_audit_trail(tracking_id, itertools.chain([first_chunk], chunks)),
+            content_type='application/json'
+        )
         
     except Exception as e:
         logger.error(f"Failed to get audit trail: {e}")
@@ -322,3 +333,64 @@ def get_complaint_audit_trail(request, tracking_id):
             {"error": str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
+
+
+def _audit_trail_chunks(tracking_id, rows):
+    """
+    Turn audit-trail rows into response events, AUDIT_TRAIL_CHUNK_SIZE at a
+    time, verifying each chunk on-chain with one batched call.
+    """
+    service = get_blockchain_service()
+    
+    while chunk := list(itertools.islice(rows, AUDIT_TRAIL_CHUNK_SIZE)):
+        verified_flags = service.verify_events_batch(
+            tracking_id,
+            [tx.event_hash for tx in chunk]
+        )
+        
+        yield [
+            {
+                "event_type": tx.event_type,
+                "timestamp": tx.timestamp.isoformat(),
+                "tx_hash": tx.tx_hash,
+                "block_number": tx.block_number,
+                "event_hash": tx.event_hash,
+                "verified_on_chain": verified,
+                "gas_used": tx.gas_used,
+                "explorer_url": get_explorer_url(tx.tx_hash)
+            }
+            for tx, verified in zip(chunk, verified_flags)
+        ]
+
+
+def _stream_audit_trail(tracking_id, chunks):
+    """
+    Encode the audit-trail response piece by piece:
+    {"tracking_id": ..., "events": [...], "total_events": n}
+    
+    The 200 status has already been sent by the time a later chunk can
+    fail, so a failure ends the events early and adds "error": ... to
+    keep the document valid JSON.
+    """
+    yield b'{"tracking_id":' + orjson.dumps(tracking_id) + b',"events":['
+    
+    total = 0
+    error = None
+    try:
+        for events in chunks:
+            if not events:
+                continue
+            if total:
+                yield b','
+            # Encode the chunk as an array and drop its brackets
+            yield orjson.dumps(events)[1:-1]
+            total += len(events)
+    except Exception as e:
+        logger.error(f"Audit trail for {tracking_id} failed after {total} events: {e}")
+        error = str(e)
+    
+    yield b'],"total_events":' + str(total).encode()
+    if error is not None:
+        yield b',"error":' + orjson.dumps(error)
+    yield b'}'
+
@@ -38,6 +38,26 @@ BLOCKCHAIN_PRIVATE_KEY = os.getenv('BLOCKCHAIN_PRIVATE_KEY', '')
 BLOCKCHAIN_GAS_LIMIT = int(os.getenv('BLOCKCHAIN_GAS_LIMIT', '500000'))
 BLOCKCHAIN_GAS_PRICE_MULTIPLIER = float(os.getenv('BLOCKCHAIN_GAS_PRICE_MULTIPLIER', '1.1'))
 BLOCKCHAIN_TX_TIMEOUT = int(os.getenv('BLOCKCHAIN_TX_TIMEOUT', '120'))
+# Seconds a fetched gas price is reused before asking the node again
+BLOCKCHAIN_GAS_PRICE_TTL = float(os.getenv('BLOCKCHAIN_GAS_PRICE_TTL', '10'))
+
+# Rows per multi-row INSERT/UPDATE for BlockchainTransaction writes
+BLOCKCHAIN_BULK_BATCH_SIZE = int(os.getenv('BLOCKCHAIN_BULK_BATCH_SIZE', '500'))
+
+# Seconds to cache read-only contract calls (verifyEvent, getSLAStatus, ...);
+# confirmed events and evidence anchors are cached without expiry
+BLOCKCHAIN_READ_CACHE_TTL = int(os.getenv('BLOCKCHAIN_READ_CACHE_TTL', '30'))
+
+# Keep-alive connections to the node shared by all threads in a process
+BLOCKCHAIN_HTTP_POOL_SIZE = int(os.getenv('BLOCKCHAIN_HTTP_POOL_SIZE', '32'))
+
+# JSON-RPC calls sent per HTTP request for receipt and block lookups
+BLOCKCHAIN_RPC_BATCH_SIZE = int(os.getenv('BLOCKCHAIN_RPC_BATCH_SIZE', '100'))
+
+# Complaint events are queued in Redis and logged in batches of up to this
+# many per transaction, flushed every BLOCKCHAIN_EVENT_FLUSH_SECONDS
+BLOCKCHAIN_EVENT_BATCH_SIZE = int(os.getenv('BLOCKCHAIN_EVENT_BATCH_SIZE', '200'))
+BLOCKCHAIN_EVENT_FLUSH_SECONDS = float(os.getenv('BLOCKCHAIN_EVENT_FLUSH_SECONDS', '5'))
 
 # Proof of Authority
 BLOCKCHAIN_USE_POA = os.getenv('BLOCKCHAIN_USE_POA', 'false').lower() == 'true'
@@ -59,6 +79,8 @@ MEDIA_URL = os.getenv('MEDIA_URL', '/media/')
 import ssl
 
 CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0')
+# Redis holding the queue of complaint events waiting to be batched
+BLOCKCHAIN_EVENT_QUEUE_URL = os.getenv('BLOCKCHAIN_EVENT_QUEUE_URL', CELERY_BROKER_URL)
 CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
 
 # SSL Configuration for Upstash Redis (rediss://)
@@ -75,6 +97,9 @@ if CELERY_BROKER_URL.startswith('rediss://'):
             2: 1,  # TCP_KEEPINTVL
             3: 5,  # TCP_KEEPCNT
         },
+        # Ping pooled connections Upstash may have idled out, instead of
+        # failing the next publish and paying a fresh TLS handshake then
+        'health_check_interval': 25,
     }
 
 if CELERY_RESULT_BACKEND.startswith('rediss://'):
@@ -82,10 +107,29 @@ if CELERY_RESULT_BACKEND.startswith('rediss://'):
         'ssl_cert_reqs': ssl.CERT_NONE
     }
 
+# Broker connection pooling: producers are reused rather than opened per
+# publish, and Redis connections are capped per process. The pool only grows
+# on demand, so the higher limit just keeps bursts (SLA/sync fan-out) from
+# opening and tearing down extra TLS connections
+CELERY_BROKER_POOL_LIMIT = int(os.getenv('CELERY_BROKER_POOL_LIMIT', '50'))
+CELERY_BROKER_CONNECTION_TIMEOUT = 5
+CELERY_REDIS_MAX_CONNECTIONS = int(os.getenv('CELERY_REDIS_MAX_CONNECTIONS', '20'))
+
+# Queue for network-bound blockchain writes. Defaults to the regular queue;
+# set to 'bc_eventlet' only where an eventlet worker consumes it (see
+# blockchain/tasks.py), so one process can keep many RPC calls in flight
+BLOCKCHAIN_TASK_QUEUE = os.getenv('BLOCKCHAIN_TASK_QUEUE', 'celery')
+CELERY_TASK_ROUTES = {
+    'blockchain.tasks.log_complaint_event_async': {'queue': BLOCKCHAIN_TASK_QUEUE},
+    'blockchain.tasks.anchor_evidence_async': {'queue': BLOCKCHAIN_TASK_QUEUE},
+}
+
 # Task serialization and execution settings
-CELERY_TASK_SERIALIZER = 'json'
+# Task messages use the orjson serializer (blockchain/serialization.py);
+# plain json is still accepted for messages queued before the switch
+CELERY_TASK_SERIALIZER = 'orjson'
 CELERY_RESULT_SERIALIZER = 'json'
-CELERY_ACCEPT_CONTENT = ['json']
+CELERY_ACCEPT_CONTENT = ['orjson', 'json']
 # Note: CELERY_TASK_ALWAYS_EAGER can be overridden in local.py for development
 # Default to False for production, but local.py sets it to True
 CELERY_TASK_ALWAYS_EAGER = False
@@ -100,10 +144,21 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'blockchain.tasks.check_sla_violations',
         'schedule': crontab(minute='*/15'),
     },
-    # Sync blockchain events every 10 minutes
+    # Events are persisted as they're mined by listen_blockchain_events;
+    # this hourly sync only reconciles anything the listener missed
     'sync-blockchain-events': {
         'task': 'blockchain.tasks.sync_blockchain_events',
-        'schedule': crontab(minute='*/10'),
+        'schedule': crontab(minute=30),
+    },
+    # Confirm transactions sent without waiting for a receipt
+    'poll-pending-transactions': {
+        'task': 'blockchain.tasks.poll_pending_transactions',
+        'schedule': crontab(minute='*'),
+    },
+    # Log queued complaint events in one transaction per batch
+    'flush-pending-events': {
+        'task': 'blockchain.tasks.flush_pending_events',
+        'schedule': BLOCKCHAIN_EVENT_FLUSH_SECONDS,
     },
     # Retry failed transactions every hour
     'retry-failed-transactions': {
@@ -10,6 +10,21 @@ import os
 # Add the project to path
 sys.path.insert(0, os.path.dirname(__file__))
 
+
+def get_ollama_session():
+    """One keep-alive session so every probe reuses the same Ollama socket"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    session = requests.Session()
+    session.mount('http://', HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=4,
+        max_retries=Retry(total=2, backoff_factor=0.1)
+    ))
+    return session
+
 def test_text_classification():
     """Test text classification with the exact input from your logs"""
     
@@ -29,9 +44,11 @@ def test_text_classification():
     print("STEP 1: Testing Ollama Connection")
     print("=" * 60)
     
+    import requests
+    sess = get_ollama_session()
+    
     try:
-        import requests
-        resp = requests.get("http://localhost:11434/api/tags", timeout=2)
+        resp = sess.get("http://localhost:11434/api/tags", timeout=2)
         
         if resp.status_code == 200:
             print("✅ Ollama is running")
@@ -58,7 +75,7 @@ def test_text_classification():
         from ml.intent_extractor import extract_intent_or_invalid
         
         print("Calling extract_intent_or_invalid()...")
-        intent = extract_intent_or_invalid(title, description)
+        intent = extract_intent_or_invalid(title, description, session=sess)
         
         print(f"\n📤 Result: '{intent}'")
         
@@ -92,7 +109,7 @@ def test_text_classification():
         from ml.text_router import route_issue
         
         print("Calling route_issue()...")
-        result = route_issue(title, description)
+        result = route_issue(title, description, session=sess)
         
         print(f"\n📤 Result:")
         print(f"   Status: {result.get('status')}")
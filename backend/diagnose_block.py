@@ -3,9 +3,46 @@ Ganache Diagnostic Script
 Run this to diagnose the insufficient funds issue
 """
 
+import requests
 from web3 import Web3
 import sys
 
+_WEI_PER_ETH = 10**18
+
+
+def _to_eth(wei):
+    """Wei to ETH as a float (display only; skips from_wei's Decimal per call)"""
+    return wei / _WEI_PER_ETH
+
+
+def get_balances(ganache_url, addresses):
+    """
+    Fetch several balances with one batched eth_getBalance request
+    
+    Returns:
+        One entry per address: balance in wei, or the RPC error dict
+    """
+    payload = [
+        {"jsonrpc": "2.0", "method": "eth_getBalance", "params": [address, "latest"], "id": i}
+        for i, address in enumerate(addresses)
+    ]
+    resp = requests.post(ganache_url, json=payload, timeout=10)
+    resp.raise_for_status()
+    
+    # Batch replies may come back in any order
+    by_id = {item.get("id"): item for item in resp.json()}
+    
+    balances = []
+    for i in range(len(addresses)):
+        item = by_id.get(i, {})
+        if "result" in item:
+            balances.append(int(item["result"], 16))
+        else:
+            balances.append(item.get("error", {"message": "no response"}))
+    
+    return balances
+
+
 def diagnose_ganache():
     print("=" * 70)
     print("GANACHE BLOCKCHAIN DIAGNOSTIC")
@@ -36,13 +73,20 @@ def diagnose_ganache():
         # Your current account from the error log
         your_account = "0x3d97Ac3318bd24d481a62b9ee6c31DcDB1dDa4d0"
         
+        # Get all Ganache accounts, then every balance in one round trip
+        accounts = w3.eth.accounts
+        balances = get_balances(ganache_url, [your_account] + list(accounts[:5]))
+        your_balance = balances[0]
+        
         print("-" * 70)
         print("YOUR CURRENT ACCOUNT:")
         print("-" * 70)
         
         try:
-            balance = w3.eth.get_balance(your_account)
-            balance_eth = w3.from_wei(balance, 'ether')
+            if isinstance(your_balance, dict):
+                raise ValueError(your_balance.get("message"))
+            
+            balance_eth = _to_eth(your_balance)
             
             print(f"Address: {your_account}")
             print(f"Balance: {balance_eth} ETH")
@@ -64,9 +108,6 @@ def diagnose_ganache():
         print("GANACHE DEFAULT ACCOUNTS (First 5):")
         print("-" * 70)
         
-        # Get all Ganache accounts
-        accounts = w3.eth.accounts
-        
         if not accounts:
             print("❌ No accounts found in Ganache!")
             return False
@@ -74,8 +115,7 @@ def diagnose_ganache():
         print(f"Found {len(accounts)} accounts\n")
         
         for i, account in enumerate(accounts[:5]):
-            balance = w3.eth.get_balance(account)
-            balance_eth = w3.from_wei(balance, 'ether')
+            balance_eth = _to_eth(balances[i + 1])
             
             is_your_account = account.lower() == your_account.lower()
             marker = " ← YOUR ACCOUNT" if is_your_account else ""
@@ -89,10 +129,7 @@ def diagnose_ganache():
         print("-" * 70)
         
         # Check if your account exists and has funds
-        your_balance = w3.eth.get_balance(your_account)
-        your_balance_eth = w3.from_wei(your_balance, 'ether')
-        
-        if your_balance_eth < 0.1:
+        if isinstance(your_balance, dict) or _to_eth(your_balance) < 0.1:
             print("\n🔧 FIX OPTION 1: Use a pre-funded Ganache account")
             print("   Replace your private key in settings with one from Ganache's default accounts")
             print(f"   Ganache Account #0: {accounts[0]}")
@@ -1,8 +1,31 @@
 # backend/ml/apps.py
 # Django app configuration to load ML model on startup
 
+import os
+import sys
+import threading
+
 from django.apps import AppConfig
 
+# manage.py commands that serve predictions; every other command
+# (migrate, shell, collectstatic, ...) skips loading TensorFlow
+MODEL_SERVING_COMMANDS = {'runserver'}
+
+
+def _serves_predictions() -> bool:
+    """Whether this process will handle HTTP requests"""
+    prog = os.path.basename(sys.argv[0]) if sys.argv else ''
+    
+    if prog == 'manage.py':
+        command = sys.argv[1] if len(sys.argv) > 1 else ''
+        if command not in MODEL_SERVING_COMMANDS:
+            return False
+        # The autoreloader's parent process only watches files
+        return os.environ.get('RUN_MAIN') == 'true' or '--noreload' in sys.argv
+    
+    # Celery workers and beat never classify images
+    return 'celery' not in prog
+
 
 class MlConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
@@ -14,8 +37,11 @@ class MlConfig(AppConfig):
         Called when Django starts.
         This is where we load the ML model.
         """
-        # Import and load the model
+        if not _serves_predictions():
+            return
+        
+        # Load in the background so the server starts listening straight
+        # away; predictions wait for the load to finish
         from . import views
-        print("🤖 Loading ML model on Django startup...")
-        views.load_model()
-        print("✅ ML module ready!")
\ No newline at end of file
+        print("🤖 Loading ML model in the background...")
+        threading.Thread(target=views.load_model, name='ml-model-load', daemon=True).start()
\ No newline at end of file
@@ -0,0 +1,87 @@
+# backend/ml/batching.py
+"""
+Micro-batching for image model inference.
+
+Each predict() call through Keras pays the same dispatch overhead whether
+it scores one image or sixteen. Requests that arrive together are queued
+here; one worker thread per process waits at most BATCH_WINDOW_SECONDS
+after the first of them, stacks up to MAX_BATCH_SIZE images and scores
+them with a single model.predict().
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+MAX_BATCH_SIZE = 16
+BATCH_WINDOW_SECONDS = 0.005
+
+
+class InferenceBatcher:
+    def __init__(self, model):
+        self.model = model
+        self._queue = queue.Queue()
+        self._worker_pid = None
+        self._lock = threading.Lock()
+    
+    def predict(self, image_batch: np.ndarray, timeout: float = 60) -> np.ndarray:
+        """
+        Score a (1, H, W, C) image, batched with concurrent callers.
+        
+        Returns:
+            This image's (1, n_classes) predictions
+        """
+        self._ensure_worker()
+        
+        future = Future()
+        self._queue.put((image_batch, future))
+        return future.result(timeout)
+    
+    def _ensure_worker(self):
+        # Threads don't survive fork; each worker process starts its own
+        pid = os.getpid()
+        if self._worker_pid != pid:
+            with self._lock:
+                if self._worker_pid != pid:
+                    self._queue = queue.Queue()
+                    threading.Thread(
+                        target=self._run,
+                        args=(self._queue,),
+                        name='ml-inference-batcher',
+                        daemon=True
+                    ).start()
+                    self._worker_pid = pid
+    
+    def _run(self, requests: queue.Queue):
+        while True:
+            batch = [requests.get()]
+            
+            deadline = time.monotonic() + BATCH_WINDOW_SECONDS
+            while len(batch) < MAX_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(requests.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            self._score(batch)
+    
+    def _score(self, batch):
+        try:
+            # Copies each caller's input, so their buffers are free again
+            # as soon as their own result is set
+            stacked = np.concatenate([image for image, _ in batch], axis=0)
+            predictions = self.model.predict(stacked, verbose=0)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        
+        for i, (_, future) in enumerate(batch):
+            future.set_result(predictions[i:i + 1])
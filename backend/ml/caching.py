@@ -0,0 +1,53 @@
+# backend/ml/caching.py
+"""
+Result cache for text classification.
+
+Resubmitted complaints (double clicks, edits that don't touch the text)
+would otherwise pay for another Ollama generate and embedding. Results
+are kept in Django's cache, keyed on a hash of the title and description.
+"""
+
+import hashlib
+
+TEXT_CACHE_TIMEOUT = 60 * 60
+
+
+def text_cache_key(prefix: str, title: str, description: str) -> str:
+    digest = hashlib.blake2b(
+        f"{title}\0{description}".encode(),
+        digest_size=16
+    ).hexdigest()
+    return f"ml:{prefix}:{digest}"
+
+
+def get_or_compute(key: str, compute, cacheable=lambda result: True):
+    """
+    Return the cached result for key, or compute and cache it.
+    
+    Args:
+        key: Cache key (see text_cache_key)
+        compute: Zero-argument callable producing the result
+        cacheable: Whether a result may be cached (failures shouldn't be)
+    """
+    try:
+        from django.core.cache import cache
+        
+        # The cache backends hand back a fresh unpickled copy, so callers
+        # can't mutate a stored result
+        result = cache.get(key)
+    except Exception:
+        # Outside Django (debug scripts) or cache unavailable
+        return compute()
+    
+    if result is not None:
+        return result
+    
+    result = compute()
+    
+    if result is not None and cacheable(result):
+        try:
+            cache.set(key, result, TEXT_CACHE_TIMEOUT)
+        except Exception:
+            pass
+    
+    return result
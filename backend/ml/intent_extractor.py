@@ -4,11 +4,47 @@ Intent Extractor using Ollama LLM
 Validates and extracts core civic issue from user input
 """
 
+import json
+import os
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Optional
 
+from .caching import get_or_compute, text_cache_key
+
 OLLAMA_URL = "http://localhost:11434/api/generate"
 
+# Shared keep-alive session to Ollama (requests sessions are thread-safe
+# for this use); created on first call, per process
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_ollama_session() -> requests.Session:
+    """Get the pooled HTTP session used for Ollama generate calls"""
+    global _session
+    
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+                _session = session
+    
+    return _session
+
+
+def _reset_session():
+    # Don't share pooled sockets with the parent after a fork
+    global _session, _session_lock
+    _session = None
+    _session_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_session)
+
 PROMPT = """You are given a civic complaint.
 
 If the text is meaningless, gibberish, unrelated to civic issues,
@@ -33,8 +69,19 @@ Complaint:
 {complaint}
 Response:"""
 
+# Split once so each call is a plain concatenation rather than a format()
+_PROMPT_HEAD, _PROMPT_TAIL = PROMPT.split("{complaint}")
 
-def extract_intent_or_invalid(title: str, description: str, timeout: int = 10) -> Optional[str]:
+# Answers are one sentence; stop reading a runaway generation after this
+MAX_RESPONSE_CHARS = 300
+
+
+def extract_intent_or_invalid(
+    title: str,
+    description: str,
+    timeout: int = 10,
+    session: Optional[requests.Session] = None
+) -> Optional[str]:
     """
     Extract intent from complaint or return INVALID
     
@@ -42,10 +89,55 @@ def extract_intent_or_invalid(title: str, description: str, timeout: int = 10) -
         title: Issue title
         description: Issue description
         timeout: Request timeout in seconds
+        session: Optional requests.Session to use instead of the shared one
         
     Returns:
         Extracted intent or "INVALID", or None if Ollama is unavailable
     """
+    # None (Ollama unavailable) is never cached
+    return get_or_compute(
+        text_cache_key("intent", title, description),
+        lambda: _extract_intent(title, description, timeout, session)
+    )
+
+
+def _read_streamed_response(response) -> str:
+    """
+    Accumulate a streamed generate response, stopping as soon as the
+    answer is complete rather than waiting for the model's EOS.
+    
+    The answer is either INVALID or one sentence, so it is complete once a
+    newline follows some text (or INVALID is followed by anything that
+    ends the word). Leaving early closes the connection, which makes
+    Ollama stop generating.
+    """
+    text = ""
+    
+    for line in response.iter_lines():
+        if not line:
+            continue
+        
+        chunk = json.loads(line)
+        text += chunk.get("response", "")
+        
+        if chunk.get("done"):
+            break
+        
+        stripped = text.strip()
+        if not stripped:
+            continue
+        
+        if "\n" in text.lstrip():
+            break
+        if stripped.upper() == "INVALID" and text.rstrip() != text:
+            break
+        if len(text) >= MAX_RESPONSE_CHARS:
+            break
+    
+    return text.strip().split("\n", 1)[0].strip()
+
+
+def _extract_intent(title, description, timeout, session) -> Optional[str]:
     complaint = f"{title}\n{description}".strip()
     
     print(f"\nINTENT EXTRACTION:")
@@ -56,20 +148,22 @@ def extract_intent_or_invalid(title: str, description: str, timeout: int = 10) -
         return "INVALID"
     
     try:
-        response = requests.post(
+        http = session or get_ollama_session()
+        with http.post(
             OLLAMA_URL,
             json={
                 "model": "qwen2.5:1.5b-instruct",
-                "prompt": PROMPT.format(complaint=complaint),
-                "stream": False,
+                "prompt": _PROMPT_HEAD + complaint + _PROMPT_TAIL,
+                "stream": True,
                 "options": {
                     "temperature": 0.3
                 }
             },
+            stream=True,
             timeout=timeout
-        )
-        response.raise_for_status()
-        result = response.json()["response"].strip()
+        ) as response:
+            response.raise_for_status()
+            result = _read_streamed_response(response)
         
         print(f"   → Ollama response: '{result}'")
         return result
@@ -0,0 +1,62 @@
+import base64
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ml.views import MODEL_PATH, TFLITE_MODEL_PATH, preprocess_image
+
+SAMPLE_SUFFIXES = {'.jpg', '.jpeg', '.png', '.webp'}
+
+
+class Command(BaseCommand):
+    help = 'Convert the Keras image model to a quantized TFLite model'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--samples',
+            type=Path,
+            help='Directory of sample images for full INT8 calibration '
+                 '(without it, weights-only dynamic range quantization is used)',
+        )
+        
+        parser.add_argument(
+            '--max-samples',
+            type=int,
+            default=200,
+            help='Maximum number of calibration images',
+        )
+    
+    def handle(self, *args, **options):
+        import tensorflow as tf
+        
+        samples = options.get('samples')
+        
+        self.stdout.write(self.style.WARNING(f'Loading {MODEL_PATH.name}...'))
+        model = tf.keras.models.load_model(str(MODEL_PATH))
+        
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        
+        if samples:
+            paths = sorted(
+                p for p in samples.iterdir() if p.suffix.lower() in SAMPLE_SUFFIXES
+            )[:options['max_samples']]
+            if not paths:
+                raise CommandError(f'No sample images found in {samples}')
+            
+            self.stdout.write(f'  Calibrating INT8 on {len(paths)} images')
+            converter.representative_dataset = lambda: self._representative_dataset(paths)
+            converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        else:
+            self.stdout.write('  No --samples given; using dynamic range quantization')
+        
+        TFLITE_MODEL_PATH.write_bytes(converter.convert())
+        
+        self.stdout.write(self.style.SUCCESS(f'✓ Wrote {TFLITE_MODEL_PATH}'))
+        self.stdout.write('  Restart the server to serve predictions from it')
+    
+    def _representative_dataset(self, paths):
+        # Same preprocessing the view applies to uploaded images
+        for path in paths:
+            image_base64 = base64.b64encode(path.read_bytes()).decode()
+            yield [preprocess_image(image_base64).copy()]
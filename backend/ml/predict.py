@@ -1,35 +1,53 @@
 # backend/ml/predict.py
 # Add this to your backend's ml folder or create a new endpoint file
 
+import threading
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
-import tensorflow as tf
-import numpy as np
-from PIL import Image
-import io
-import base64
 from typing import Optional
 
 router = APIRouter()
 
-# Load the model once at startup
 MODEL_PATH = "ml/model/civic_issue_imgmodel (1).keras"
 CLASS_INDICES_PATH = "ml/model/class_indices.json"
 
-try:
-    model = tf.keras.models.load_model(MODEL_PATH)
-    print(f"✓ Model loaded successfully from {MODEL_PATH}")
+# Loaded on the first prediction, not at import: TensorFlow alone adds
+# seconds and hundreds of MB to every process that imports this module
+model = None
+index_to_department = {}
+_model_loaded = False
+_model_lock = threading.Lock()
+
+
+def _ensure_model():
+    """Load the model and class indices once (thread-safe)"""
+    global model, index_to_department, _model_loaded
+    
+    if _model_loaded:
+        return
     
-    with open(CLASS_INDICES_PATH, 'r') as f:
-        import json
-        class_indices = json.load(f)
-    # Reverse the class_indices to get index -> department mapping
-    index_to_department = {v: k for k, v in class_indices.items()}
-    print(f"✓ Class indices loaded: {class_indices}")
-except Exception as e:
-    print(f"✗ Error loading model: {e}")
-    model = None
-    index_to_department = {}
+    with _model_lock:
+        if _model_loaded:
+            return
+        
+        try:
+            import json
+            import tensorflow as tf
+            
+            model = tf.keras.models.load_model(MODEL_PATH)
+            print(f"✓ Model loaded successfully from {MODEL_PATH}")
+            
+            with open(CLASS_INDICES_PATH, 'r') as f:
+                class_indices = json.load(f)
+            # Reverse the class_indices to get index -> department mapping
+            index_to_department = {v: k for k, v in class_indices.items()}
+            print(f"✓ Class indices loaded: {class_indices}")
+        except Exception as e:
+            print(f"✗ Error loading model: {e}")
+            model = None
+            index_to_department = {}
+        
+        _model_loaded = True
 
 
 class PredictRequest(BaseModel):
@@ -43,7 +61,7 @@ class PredictResponse(BaseModel):
     all_probabilities: Optional[dict] = None
 
 
-def preprocess_image(image_base64: str) -> np.ndarray:
+def preprocess_image(image_base64: str) -> "np.ndarray":
     """
     Preprocess the base64 image for model prediction
     
@@ -53,6 +71,12 @@ def preprocess_image(image_base64: str) -> np.ndarray:
     Returns:
         Preprocessed image array ready for model input
     """
+    import base64
+    import io
+    
+    import numpy as np
+    from PIL import Image
+    
     try:
         # Remove data URL prefix if present
         if ',' in image_base64:
@@ -97,6 +121,8 @@ async def predict_department(request: PredictRequest):
     Returns:
         PredictResponse with predicted department and confidence
     """
+    _ensure_model()
+    
     if model is None:
         raise HTTPException(
             status_code=500, 
@@ -111,7 +137,7 @@ async def predict_department(request: PredictRequest):
         predictions = model.predict(processed_image, verbose=0)
         
         # Get the predicted class index
-        predicted_index = np.argmax(predictions[0])
+        predicted_index = int(predictions[0].argmax())
         confidence = float(predictions[0][predicted_index])
         
         # Get the department name
@@ -5,6 +5,7 @@ FIXED: Index-safe mapping, CNN-compatible output
 
 import numpy as np
 from sentence_transformers import SentenceTransformer
+from .caching import get_or_compute, text_cache_key
 from .intent_extractor import extract_intent_or_invalid
 
 DEPARTMENTS = {
@@ -40,9 +41,10 @@ def get_embedder():
         _embedder = SentenceTransformer("all-MiniLM-L6-v2")
 
         dept_texts = list(DEPARTMENTS.values())
-        _dept_embeds = _embedder.encode(
-            dept_texts,
-            normalize_embeddings=True
+        # Contiguous float32 (n_departments, dim) so scoring is one matvec
+        _dept_embeds = np.ascontiguousarray(
+            _embedder.encode(dept_texts, normalize_embeddings=True),
+            dtype=np.float32
         )
 
         print("✓ Embedder loaded & department embeddings cached")
@@ -50,12 +52,20 @@ def get_embedder():
     return _embedder, _dept_embeds
 
 
-def route_issue(title: str, description: str) -> dict:
+def route_issue(title: str, description: str, session=None) -> dict:
+    return get_or_compute(
+        text_cache_key("route", title, description),
+        lambda: _route_issue(title, description, session),
+        cacheable=lambda result: result["status"] != "OLLAMA_ERROR"
+    )
+
+
+def _route_issue(title: str, description: str, session=None) -> dict:
     print("\n TEXT ROUTING")
     print(f"   Title: {title[:50]}")
     print(f"   Desc : {description[:50]}")
 
-    intent = extract_intent_or_invalid(title, description)
+    intent = extract_intent_or_invalid(title, description, session=session)
 
     if intent is None:
         return {
@@ -79,13 +89,15 @@ def route_issue(title: str, description: str) -> dict:
         normalize_embeddings=True
     )
 
-    similarities = np.dot(dept_embeds, intent_embed)
+    similarities = dept_embeds @ intent_embed.astype(np.float32, copy=False)
 
     best_idx = int(np.argmax(similarities))
     best_score = float(similarities[best_idx])
 
-    sorted_sims = np.sort(similarities)
-    margin = sorted_sims[-1] - sorted_sims[-2]
+    # Runner-up without sorting: mask the best, take the max, restore
+    similarities[best_idx] = -np.inf
+    margin = best_score - float(similarities.max())
+    similarities[best_idx] = best_score
 
     department_name = DEPT_NAME_MAPPING[best_idx]
 
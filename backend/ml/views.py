@@ -4,14 +4,16 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-import tensorflow as tf
 import numpy as np
 from PIL import Image
 import io
 import base64
 import json
+import os
+import threading
 from pathlib import Path
 
+from .batching import InferenceBatcher
 from .hybrid_classifier import hybrid_classify
 
 
@@ -19,24 +21,109 @@ BASE_DIR = Path(__file__).resolve().parent
 
 MODEL_PATH = BASE_DIR / "model" / "civic_issue_imgmodel (1).keras"
 CLASS_INDICES_PATH = BASE_DIR / "model" / "class_indices.json"
+# Quantized copy written by `manage.py quantize_image_model`; used instead
+# of the Keras model when present
+TFLITE_MODEL_PATH = BASE_DIR / "model" / "civic_issue_imgmodel.tflite"
 CONFIDENCE_THRESHOLD = 0.45
+IMAGE_SIZE = (224, 224)
+
+# Per-thread (1, 224, 224, 3) float32 model input, reused across requests
+_preprocess_local = threading.local()
 
 _model = None
+_batcher = None
 _index_to_department = {}
+_model_loaded = False
+_model_lock = threading.Lock()
+
+
+def _reset_model_lock():
+    # A fork while the background load holds the lock would leave the
+    # child's copy locked forever; the child loads its own model instead
+    global _model_lock
+    _model_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_model_lock)
+
+
+class TFLiteModel:
+    """
+    Keras-style predict() over a TFLite interpreter.
+    
+    One interpreter per process; invoke() isn't thread-safe, so calls are
+    serialized. Quantized (int8) inputs/outputs are converted here so
+    callers always pass and get float32.
+    """
+    
+    def __init__(self, model_path):
+        import tensorflow as tf
+        
+        self._interpreter = tf.lite.Interpreter(
+            model_path=str(model_path),
+            num_threads=os.cpu_count()
+        )
+        self._interpreter.allocate_tensors()
+        self._input = self._interpreter.get_input_details()[0]
+        self._output = self._interpreter.get_output_details()[0]
+        self._lock = threading.Lock()
+    
+    def predict(self, x, verbose=0):
+        input_dtype = self._input['dtype']
+        if input_dtype != np.float32:
+            scale, zero_point = self._input['quantization']
+            x = np.round(x / scale + zero_point).astype(input_dtype)
+        
+        # The converted graph has a fixed batch of one; invoking it per row
+        # is cheap and avoids reallocating tensors for every batch size
+        rows = []
+        with self._lock:
+            for i in range(len(x)):
+                self._interpreter.set_tensor(self._input['index'], x[i:i + 1])
+                self._interpreter.invoke()
+                rows.append(self._interpreter.get_tensor(self._output['index']))
+        y = np.concatenate(rows, axis=0)
+        
+        if self._output['dtype'] != np.float32:
+            scale, zero_point = self._output['quantization']
+            y = (y.astype(np.float32) - zero_point) * scale
+        
+        return y
 
 
 def load_model():
     """
-    Load the ML model and class indices.
-    This is called once when Django starts.
+    Load the ML model and class indices (once per process, thread-safe).
+    
+    MlConfig.ready() starts this on a background thread for serving
+    processes; a request arriving before it finishes waits on the lock.
     """
-    global _model, _index_to_department
+    global _model, _index_to_department, _model_loaded
     
-    if _model is not None:
+    if _model_loaded:
         return
+    
+    with _model_lock:
+        if _model_loaded:
+            return
+        
+        _load_model()
+        _model_loaded = True
+
+
+def _load_model():
+    global _model, _batcher, _index_to_department
+    
     try:
-        _model = tf.keras.models.load_model(str(MODEL_PATH))
-        print(f"ML Model loaded successfully from {MODEL_PATH}")
+        if TFLITE_MODEL_PATH.exists():
+            _model = TFLiteModel(TFLITE_MODEL_PATH)
+            print(f"Quantized ML Model loaded from {TFLITE_MODEL_PATH}")
+        else:
+            import tensorflow as tf
+            
+            _model = tf.keras.models.load_model(str(MODEL_PATH))
+            print(f"ML Model loaded successfully from {MODEL_PATH}")
         
         with open(CLASS_INDICES_PATH, 'r') as f:
             class_indices = json.load(f)
@@ -44,13 +131,14 @@ def load_model():
         _index_to_department = {v: k for k, v in class_indices.items()}
         print(f"Class indices loaded: {class_indices}")
         
+        _batcher = InferenceBatcher(_model)
+        
     except Exception as e:
         print(f"Error loading ML model: {e}")
         _model = None
+        _batcher = None
         _index_to_department = {}
 
-load_model()
-
 
 def preprocess_image(image_base64):
     """
@@ -60,7 +148,8 @@ def preprocess_image(image_base64):
         image_base64: Base64 encoded image string
         
     Returns:
-        Preprocessed image array ready for model input
+        Preprocessed image array ready for model input. The array is this
+        thread's reusable buffer, overwritten by the next call
         
     Raises:
         ValueError: If image preprocessing fails
@@ -76,15 +165,16 @@ def preprocess_image(image_base64):
         if image.mode != 'RGB':
             image = image.convert('RGB')
         
-        image = image.resize((224, 224))
-        
-        image_array = np.array(image)
+        image = image.resize(IMAGE_SIZE)
         
-        image_array = image_array.astype('float32') / 255.0
+        buf = getattr(_preprocess_local, 'buf', None)
+        if buf is None:
+            buf = _preprocess_local.buf = np.empty((1, *IMAGE_SIZE, 3), dtype=np.float32)
         
-        image_array = np.expand_dims(image_array, axis=0)
+        # Cast and scale to [0, 1] in one pass, straight into the batch slot
+        np.multiply(np.asarray(image), np.float32(1 / 255.0), out=buf[0])
         
-        return image_array
+        return buf
         
     except Exception as e:
         raise ValueError(f"Error preprocessing image: {str(e)}")
@@ -115,6 +205,8 @@ def predict_department(request):
             "text_result": {...}
         }
     """
+    load_model()
+    
     if _model is None:
         return Response(
             {
@@ -147,7 +239,8 @@ def predict_department(request):
         processed_image = preprocess_image(image_base64)
         print(" Image preprocessed")
         
-        predictions = _model.predict(processed_image, verbose=0)
+        # Scored together with any concurrent requests
+        predictions = _batcher.predict(processed_image)
         
         predicted_index = np.argmax(predictions[0])
         image_confidence = float(predictions[0][predicted_index])
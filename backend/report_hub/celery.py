@@ -7,6 +7,9 @@ This file configures Celery for async blockchain operations.
 import os
 from celery import Celery
 
+# Registers the 'orjson' task serializer
+import blockchain.serialization  # noqa: F401
+
 # Set default Django settings module
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', os.getenv('DJANGO_SETTINGS_MODULE', 'report_hub.settings.local'))
 
@@ -18,9 +21,9 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 
 # Configure Celery for production-safe operation
 app.conf.update(
-    task_serializer='json',
+    task_serializer='orjson',
     result_serializer='json',
-    accept_content=['json'],
+    accept_content=['orjson', 'json'],
     timezone='UTC',
     enable_utc=True,
     task_track_started=True,
@@ -73,6 +73,13 @@ except ImportError:
     BLOCKCHAIN_GAS_LIMIT = 500000
     BLOCKCHAIN_GAS_PRICE_MULTIPLIER = 1.1
     BLOCKCHAIN_TX_TIMEOUT = 120
+    BLOCKCHAIN_GAS_PRICE_TTL = 10
+    BLOCKCHAIN_BULK_BATCH_SIZE = 500
+    BLOCKCHAIN_RPC_BATCH_SIZE = 100
+    BLOCKCHAIN_HTTP_POOL_SIZE = 32
+    BLOCKCHAIN_READ_CACHE_TTL = 30
+    BLOCKCHAIN_EVENT_BATCH_SIZE = 200
+    BLOCKCHAIN_EVENT_FLUSH_SECONDS = 5
     BLOCKCHAIN_USE_POA = False
     BLOCKCHAIN_EXPLORER_URL = 'https://etherscan.io'
     
@@ -81,6 +88,7 @@ except ImportError:
     
     # Celery (optional)
     CELERY_BROKER_URL = 'redis://localhost:6379/0'
+    BLOCKCHAIN_EVENT_QUEUE_URL = CELERY_BROKER_URL
     CELERY_RESULT_BACKEND = 'redis://localhost:6379/0'
     CELERY_TASK_ALWAYS_EAGER = True
     CELERY_TASK_EAGER_PROPAGATES = True
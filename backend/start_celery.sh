@@ -21,3 +21,6 @@ celery -A report_hub worker --loglevel=info --pool=solo -E
 
 # Alternative for production (Linux):
 # celery -A report_hub worker --loglevel=info --concurrency=4
+#
+# With BLOCKCHAIN_TASK_QUEUE=bc_eventlet, also start a worker for that queue:
+# celery -A report_hub worker -Q bc_eventlet -P eventlet -c 100 --loglevel=info